@@ -7,27 +7,37 @@ https://github.com/xathon/Allianz-BonusDrive-HomeAssistant
 
 from __future__ import annotations
 
-from datetime import timedelta
 from typing import TYPE_CHECKING
 
-from homeassistant.const import CONF_EMAIL, CONF_PASSWORD, Platform
-from homeassistant.loader import async_get_loaded_integration
+from homeassistant.const import Platform
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.importlib import async_import_module
 
-from .api import BonusdriveApiClient
-from .const import CONF_BASE_URL, CONF_PHOTON_URL, DEFAULT_BASE_URL, DOMAIN, LOGGER
-from .coordinator import BonusdriveDataUpdateCoordinator
-from .data import BonusdriveData
+from .const import DOMAIN
 
 if TYPE_CHECKING:
     from homeassistant.core import HomeAssistant
+    from homeassistant.helpers.typing import ConfigType
 
     from .data import BonusdriveConfigEntry
 
-PLATFORMS: list[Platform] = [
-    Platform.SENSOR,
-    # Platform.BINARY_SENSOR,  # Uncomment when binary sensors are implemented
-    # Platform.SWITCH,  # Uncomment when switches are implemented
-]
+PLATFORMS: list[Platform] = [Platform.SENSOR]
+
+# Client, coordinator and stores, imported on first setup
+RUNTIME_MODULE = f"{__name__}.runtime"
+SERVICES_MODULE = f"{__name__}.services"
+
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+
+async def async_setup(
+    hass: HomeAssistant,
+    config: ConfigType,  # noqa: ARG001 Unused function argument: `config`
+) -> bool:
+    """Register the services, so they validate calls even without a loaded entry."""
+    services = await async_import_module(hass, SERVICES_MODULE)
+    services.async_setup_services(hass)
+    return True
 
 
 # https://developers.home-assistant.io/docs/config_entries_index/#setting-up-an-entry
@@ -36,29 +46,8 @@ async def async_setup_entry(
     entry: BonusdriveConfigEntry,
 ) -> bool:
     """Set up this integration using UI."""
-    coordinator = BonusdriveDataUpdateCoordinator(
-        hass=hass,
-        logger=LOGGER,
-        name=DOMAIN,
-        update_interval=timedelta(minutes=15),
-    )
-
-    client = BonusdriveApiClient(
-        hass=hass,
-        base_url=entry.data.get(CONF_BASE_URL, DEFAULT_BASE_URL),
-        email=entry.data[CONF_EMAIL],
-        password=entry.data[CONF_PASSWORD],
-        photon_url=entry.data.get(CONF_PHOTON_URL),
-    )
-
-    entry.runtime_data = BonusdriveData(
-        client=client,
-        integration=async_get_loaded_integration(hass, entry.domain),
-        coordinator=coordinator,
-    )
-
-    # https://developers.home-assistant.io/docs/integration_fetching_data#coordinated-single-api-poll-for-data-for-all-entities
-    await coordinator.async_config_entry_first_refresh()
+    runtime = await async_import_module(hass, RUNTIME_MODULE)
+    await runtime.async_setup_runtime(hass, entry)
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
     entry.async_on_unload(entry.add_update_listener(async_reload_entry))
@@ -74,6 +63,15 @@ async def async_unload_entry(
     return await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
 
 
+async def async_remove_entry(
+    hass: HomeAssistant,
+    entry: BonusdriveConfigEntry,
+) -> None:
+    """Remove stored data when the entry is deleted."""
+    runtime = await async_import_module(hass, RUNTIME_MODULE)
+    await runtime.async_remove_stored_data(hass, entry.entry_id)
+
+
 async def async_reload_entry(
     hass: HomeAssistant,
     entry: BonusdriveConfigEntry,
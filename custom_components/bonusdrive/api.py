@@ -2,18 +2,40 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+import asyncio
+import time
+from collections import OrderedDict
+from contextlib import nullcontext
+from functools import partial, wraps
+from http import HTTPStatus
+from typing import TYPE_CHECKING, Any, Concatenate
 
-from allianz_bonusdrive_client import (
-    Badge,
-    BonusdriveAPIClient,
-    Scores,
-    Trip,
-)
+from aiohttp import ClientConnectionError
+from homeassistant.core import callback
+from homeassistant.helpers.aiohttp_client import async_create_clientsession
+from homeassistant.helpers.importlib import async_import_module
+
+from .breaker import CircuitBreaker
+from .const import CALL_TIMEOUT, DEFAULT_GEOMETRY_TOLERANCE
+from .geocode import CachedPhotonClient
+from .geometry import TripGeometry, process_trip_geometry
+from .metrics import BonusdriveMetrics, http_status
 
 if TYPE_CHECKING:
+    from collections.abc import Callable, Coroutine, Hashable
+
+    from aiohttp import ClientSession
+    from allianz_bonusdrive_client import Badge, BonusdriveAPIClient, Scores, Trip
     from homeassistant.core import HomeAssistant
 
+    from .geocode import GeocodeCache
+    from .pool import BonusdriveClientPool
+    from .store import BonusdriveSessionStore
+    from .transport import BonusdriveAsyncTransport
+
+# Number of detailed trips kept in memory, keyed by trip ID
+TRIP_DETAILS_CACHE_SIZE = 16
+
 
 class BonusdriveApiClientError(Exception):
     """Exception to indicate a general API error."""
@@ -27,47 +49,281 @@ class BonusdriveApiClientAuthenticationError(BonusdriveApiClientError):
     """Exception to indicate an authentication error."""
 
 
+def _single_flight[**P, T](
+    func: Callable[Concatenate[BonusdriveApiClient, P], Coroutine[Any, Any, T]],
+) -> Callable[Concatenate[BonusdriveApiClient, P], Coroutine[Any, Any, T]]:
+    """Let concurrent calls with the same arguments share one request."""
+
+    @wraps(func)
+    async def wrapper(
+        self: BonusdriveApiClient, *args: P.args, **kwargs: P.kwargs
+    ) -> T:
+        key = (func.__name__, args, tuple(sorted(kwargs.items())))
+        return await self._async_single_flight(
+            key, partial(func, self, *args, **kwargs)
+        )
+
+    return wrapper
+
+
+async def async_import_backend(
+    hass: HomeAssistant, *, native_transport: bool = False
+) -> None:
+    """
+    Import the client library, or the async transport, in the executor.
+
+    Neither is imported with this module, so loading the integration (e.g. for
+    the config flow) doesn't pull in the library and its HTTP stack. Call this
+    before creating a client, which then finds the modules already loaded.
+    """
+    await async_import_module(
+        hass,
+        f"{__package__}.transport" if native_transport else "allianz_bonusdrive_client",
+    )
+
+
+def _is_auth_error(exception: Exception) -> bool:
+    """Guess from the message whether the library failed on credentials."""
+    msg = str(exception)
+    return "401" in msg or "403" in msg or "auth" in msg.lower()
+
+
+def _is_outage(exception: BaseException) -> bool:
+    """
+    Return whether an error means the API is down rather than the request bad.
+
+    Timeouts, connection errors and 5xx responses count, also when the library
+    wrapped them in an error of its own.
+    """
+    error: BaseException | None = exception
+    while error is not None:
+        if (status := http_status(error)) is not None:
+            return status >= HTTPStatus.INTERNAL_SERVER_ERROR
+        if isinstance(error, (TimeoutError, OSError, ClientConnectionError)):
+            return True
+        error = error.__cause__
+    return False
+
+
 class BonusdriveApiClient:
     """Async wrapper for the Allianz BonusDrive API Client."""
 
-    def __init__(
+    def __init__(  # noqa: PLR0913 Too many arguments in function definition
         self,
         hass: HomeAssistant,
         base_url: str,
         email: str,
         password: str,
         photon_url: str | None = None,
+        session_store: BonusdriveSessionStore | None = None,
+        *,
+        geocode_cache: GeocodeCache | None = None,
+        native_transport: bool = False,
+        pool: BonusdriveClientPool | None = None,
+        geometry_tolerance: float = DEFAULT_GEOMETRY_TOLERANCE,
     ) -> None:
         """Initialize the API client."""
         self._hass = hass
-        self._client = BonusdriveAPIClient(
-            base_url=base_url,
-            email=email,
-            password=password,
-            tgt=None,
-            photon_url=photon_url,
-        )
+        self._base_url = base_url
+        # Latency and errors per library method (and Photon lookups)
+        self.metrics = BonusdriveMetrics()
+        self._pool = pool
+        self._native_transport = native_transport
+        self._client: BonusdriveAPIClient | BonusdriveAsyncTransport
+        self._session: ClientSession | None = None
+        if native_transport:
+            from .transport import (  # noqa: PLC0415 Loaded by async_import_backend
+                BonusdriveAsyncTransport,
+            )
+
+            # Own session (and cookie jar) per account on HA's shared
+            # connector, detached again in async_close
+            self._session = async_create_clientsession(hass, auto_cleanup=False)
+            self._client = BonusdriveAsyncTransport(
+                session=self._session,
+                base_url=base_url,
+                email=email,
+                password=password,
+                photon_url=photon_url,
+                geocode_cache=geocode_cache,
+                metrics=self.metrics,
+            )
+        else:
+            from allianz_bonusdrive_client import (  # noqa: PLC0415 Loaded by async_import_backend
+                BonusdriveAPIClient,
+            )
+
+            self._client = BonusdriveAPIClient(
+                base_url=base_url,
+                email=email,
+                password=password,
+                tgt=None,
+                photon_url=photon_url,
+            )
+            if self._client.photon is not None and geocode_cache is not None:
+                self._client.photon = CachedPhotonClient(
+                    self._client.photon, geocode_cache, self.metrics
+                )
+            if pool is not None:
+                # HA's aiohttp sessions already share one connector
+                self._client.session.mount(
+                    base_url, pool.async_acquire_adapter(base_url, self)
+                )
+        self._geocode_cache = geocode_cache
         self._authenticated = False
+        self._session_store = session_store
+        self._session_loaded = False
+        self._geometry_tolerance = geometry_tolerance
+        self._trip_details_cache: OrderedDict[str, tuple[Trip, TripGeometry | None]] = (
+            OrderedDict()
+        )
+        self.trip_details_cache_hits = 0
+        self.trip_details_cache_misses = 0
+        self._in_flight: dict[Hashable, asyncio.Task[Any]] = {}
+        self.breaker = CircuitBreaker()
+
+    @property
+    def tgt(self) -> str | None:
+        """Return the ticket-granting ticket of the current session."""
+        return self._client.tgt
+
+    async def _async_single_flight[T](
+        self, key: Hashable, func: Callable[[], Coroutine[Any, Any, T]]
+    ) -> T:
+        """
+        Await the in-flight call for a key, or start it.
+
+        The call runs in its own task, so a caller that times out or is
+        cancelled doesn't cancel it for the others.
+        """
+        task = self._in_flight.get(key)
+        if task is None:
+            task = self._hass.async_create_task(func(), eager_start=False)
+            self._in_flight[key] = task
+            task.add_done_callback(partial(self._async_flight_done, key))
+        return await asyncio.shield(task)
+
+    def _async_flight_done(self, key: Hashable, task: asyncio.Task[Any]) -> None:
+        """Forget a finished call."""
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        if not task.cancelled():
+            # Mark the exception as retrieved in case every caller gave up
+            task.exception()
 
+    @_single_flight
     async def async_authenticate(self) -> None:
-        """Authenticate with the API."""
+        """
+        Authenticate with the API.
+
+        If a TGT from a previous run is stored, the library uses it to request
+        a service ticket directly and only logs in with the password when the
+        server rejects it.
+        """
+        restored = False
+        if self._session_store is not None and not self._session_loaded:
+            self._session_loaded = True
+            if tgt := await self._session_store.async_load():
+                self._client.tgt = tgt
+                restored = True
+        previous_tgt = self._client.tgt
+
         try:
-            await self._hass.async_add_executor_job(self._client.authenticate)
+            try:
+                await self._async_call("authenticate")
+            except Exception as exception:
+                if not restored or not _is_auth_error(exception):
+                    raise
+                # The stored TGT was rejected, fall back to a fresh login
+                self._client.tgt = None
+                await self._async_call("authenticate")
             self._authenticated = True
         except Exception as exception:
             msg = str(exception)
-            if "401" in msg or "403" in msg or "auth" in msg.lower():
+            if _is_auth_error(exception):
                 raise BonusdriveApiClientAuthenticationError(msg) from exception
             raise BonusdriveApiClientCommunicationError(msg) from exception
 
+        if self._session_store is not None and self._client.tgt != previous_tgt:
+            await self._session_store.async_save(self._client.tgt)
+
+    async def _async_call(self, method: str, *args: Any, **kwargs: Any) -> Any:
+        """
+        Call a client method, in the executor if the client is blocking.
+
+        Every call goes through the circuit breaker, so no request goes out
+        while it is open, and each call's outcome is recorded exactly once.
+        """
+        func = getattr(self._client, method)
+        async with self._pool.semaphore if self._pool else nullcontext():
+            # Checked once the call may go out, the breaker may have opened
+            # while it waited
+            if not self.breaker.allow_request():
+                msg = (
+                    "Paused after repeated API errors, retrying after "
+                    f"{self.breaker.retry_at}"
+                )
+                raise BonusdriveApiClientCommunicationError(msg)
+            start = time.perf_counter()
+            try:
+                async with asyncio.timeout(CALL_TIMEOUT):
+                    if self._native_transport:
+                        result = await func(*args, **kwargs)
+                    else:
+                        result = await self._hass.async_add_executor_job(
+                            partial(func, *args, **kwargs)
+                        )
+            except ValueError:
+                # Empty response, the server is fine
+                self.metrics.record(method, (time.perf_counter() - start) * 1000)
+                self.breaker.record_success()
+                raise
+            except Exception as exception:
+                self.metrics.record(
+                    method, (time.perf_counter() - start) * 1000, exception
+                )
+                if _is_outage(exception):
+                    self.breaker.record_failure()
+                elif _is_auth_error(exception):
+                    self.breaker.release_probe()
+                else:
+                    # E.g. a 404 for an unknown trip, the server is fine
+                    self.breaker.record_success()
+                raise
+            except asyncio.CancelledError:
+                self.breaker.release_probe()
+                raise
+        self.metrics.record(method, (time.perf_counter() - start) * 1000)
+        self.breaker.record_success()
+        return result
+
+    @callback
+    def async_close(self) -> None:
+        """Give the pooled connections back and release the native session."""
+        if self._pool is not None:
+            self._pool.async_release_adapter(self._base_url, self)
+        if self._session is not None:
+            # Leaves the shared connector open for the other sessions
+            self._session.detach()
+            self._session = None
+
+    async def async_ensure_authenticated(self) -> None:
+        """Authenticate with the API unless a session already exists."""
+        if not self._authenticated:
+            await self.async_authenticate()
+
+    async def async_probe(self) -> None:
+        """Check whether the API is reachable with the cheapest request."""
+        await self.async_get_trips(amount=1)
+
+    @_single_flight
     async def async_get_scores(
         self,
         start_date: str | None = None,
         end_date: str | None = None,
     ) -> dict[str, Scores] | list:
         """Get driving scores from the API."""
-        if not self._authenticated:
-            await self.async_authenticate()
+        await self.async_ensure_authenticated()
 
         try:
             kwargs = {}
@@ -76,9 +332,7 @@ class BonusdriveApiClient:
             if end_date:
                 kwargs["endDate"] = end_date
 
-            result = await self._hass.async_add_executor_job(
-                lambda: self._client.get_scores(**kwargs)
-            )
+            result = await self._async_call("get_scores", **kwargs)
         except ValueError:
             # JSON decode error - API returned empty response (no scores)
             return {}
@@ -88,23 +342,22 @@ class BonusdriveApiClient:
         else:
             return result if result else {}
 
+    @_single_flight
     async def async_get_trips(
         self,
         amount: int = 10,
         offset: int = 0,
     ) -> list[Trip]:
         """Get trips from the API."""
-        if not self._authenticated:
-            await self.async_authenticate()
+        await self.async_ensure_authenticated()
 
         try:
-            return await self._hass.async_add_executor_job(
-                lambda: self._client.get_trips(amount=amount, offset=offset)
-            )
+            return await self._async_call("get_trips", amount=amount, offset=offset)
         except Exception as exception:
             msg = f"Error fetching trips: {exception}"
             raise BonusdriveApiClientCommunicationError(msg) from exception
 
+    @_single_flight
     async def async_get_badges(
         self,
         badge_type: str = "daily",
@@ -112,8 +365,7 @@ class BonusdriveApiClient:
         end_date: str | None = None,
     ) -> list[Badge]:
         """Get badges from the API."""
-        if not self._authenticated:
-            await self.async_authenticate()
+        await self.async_ensure_authenticated()
 
         try:
             kwargs = {"type": badge_type}
@@ -122,9 +374,7 @@ class BonusdriveApiClient:
             if end_date:
                 kwargs["endDate"] = end_date
 
-            result = await self._hass.async_add_executor_job(
-                lambda: self._client.get_badges(**kwargs)
-            )
+            result = await self._async_call("get_badges", **kwargs)
         except ValueError:
             # JSON decode error - API returned empty response (no badges)
             return []
@@ -134,26 +384,53 @@ class BonusdriveApiClient:
         else:
             return result if result else []
 
+    @_single_flight
     async def async_get_vehicle_id(self) -> str:
         """Get the vehicle ID."""
-        if not self._authenticated:
-            await self.async_authenticate()
+        await self.async_ensure_authenticated()
 
         try:
-            return await self._hass.async_add_executor_job(self._client.get_vehicleId)
+            return await self._async_call("get_vehicleId")
         except Exception as exception:
             msg = f"Error fetching vehicle ID: {exception}"
             raise BonusdriveApiClientCommunicationError(msg) from exception
 
+    def trip_geometry(self, trip_id: str) -> TripGeometry | None:
+        """Return the processed route of a trip fetched with its details."""
+        cached = self._trip_details_cache.get(trip_id)
+        return cached[1] if cached is not None else None
+
+    @_single_flight
     async def async_get_trip_details(self, trip_id: str) -> Trip:
-        """Get detailed trip information including geocoded locations."""
-        if not self._authenticated:
-            await self.async_authenticate()
+        """
+        Get detailed trip information including geocoded locations.
+
+        Trips don't change once they are recorded, so details (and the
+        geocoding that comes with them) are only fetched once per trip ID. The
+        GPS trace is replaced by a simplified route, see trip_geometry.
+        """
+        if (cached := self._trip_details_cache.get(trip_id)) is not None:
+            self._trip_details_cache.move_to_end(trip_id)
+            self.trip_details_cache_hits += 1
+            return cached[0]
+        self.trip_details_cache_misses += 1
+
+        await self.async_ensure_authenticated()
 
         try:
-            return await self._hass.async_add_executor_job(
-                lambda: self._client.get_trip_details(trip_id)
-            )
+            trip = await self._async_call("get_trip_details", trip_id)
         except Exception as exception:
             msg = f"Error fetching trip details: {exception}"
             raise BonusdriveApiClientCommunicationError(msg) from exception
+
+        if self._geocode_cache is not None:
+            self._geocode_cache.async_schedule_save()
+
+        # Only the simplified route is kept
+        geometry = await self._hass.async_add_executor_job(
+            process_trip_geometry, trip, self._geometry_tolerance
+        )
+        self._trip_details_cache[trip_id] = (trip, geometry)
+        if len(self._trip_details_cache) > TRIP_DETAILS_CACHE_SIZE:
+            self._trip_details_cache.popitem(last=False)
+        return trip
@@ -0,0 +1,385 @@
+"""Compact on-disk trip archive for bonusdrive."""
+
+from __future__ import annotations
+
+import bisect
+import json
+import math
+import mmap
+import shutil
+import threading
+from array import array
+from typing import TYPE_CHECKING, Any, TypedDict
+
+import polyline
+from homeassistant.util.file import write_utf8_file
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from pathlib import Path
+
+    from allianz_bonusdrive_client import Trip
+
+ARCHIVE_VERSION = 1
+
+# Precision of the encoded trip polyline, coordinates are stored as integers
+POLYLINE_PRECISION = 6
+COORD_SCALE = 10**POLYLINE_PRECISION
+
+# Fixed-width scalar columns: name -> array typecode. Missing values are NaN.
+COLUMNS: dict[str, str] = {
+    "start": "q",
+    "end": "q",
+    "kilometers": "f",
+    "seconds": "i",
+    "score": "f",
+    "speeding": "f",
+    "harsh_braking": "f",
+    "harsh_acceleration": "f",
+    "harsh_cornering": "f",
+    "payd": "f",
+    # Cumulative number of points after each trip, indexes the coordinate buffer
+    "geometry_end": "q",
+}
+SUB_SCORES = ("speeding", "harsh_braking", "harsh_acceleration", "harsh_cornering")
+COORDS = "coords"
+COORDS_TYPECODE = "i"
+
+
+class TripSummary(TypedDict):
+    """Scalar data of a trip, without geometry."""
+
+    trip_id: str
+    start: int
+    end: int
+    kilometers: float
+    seconds: int
+    score: float
+    speeding: float | None
+    harsh_braking: float | None
+    harsh_acceleration: float | None
+    harsh_cornering: float | None
+    payd: float | None
+
+
+def trip_summary(trip: Trip) -> TripSummary:
+    """Return the scalar data of a trip fetched from the API."""
+    scores = trip.tripScores.scores if trip.tripScores else None
+    return TripSummary(
+        trip_id=trip.tripId,
+        start=trip.tripStartTimestampUtc,
+        end=trip.tripEndTimestampUtc,
+        kilometers=trip.kilometers,
+        seconds=trip.seconds,
+        score=trip.tripScore,
+        speeding=scores.speeding if scores else None,
+        harsh_braking=scores.harsh_braking if scores else None,
+        harsh_acceleration=scores.harsh_acceleration if scores else None,
+        harsh_cornering=scores.harsh_cornering if scores else None,
+        payd=scores.payd if scores else None,
+    )
+
+
+def _float(value: float) -> float | None:
+    """Undo float32 noise of a stored value, NaN means missing."""
+    return None if math.isnan(value) else round(value, 3)
+
+
+class TripArchive:
+    """
+    Append-only columnar trip archive.
+
+    Every scalar field lives in its own file of fixed-width values and all
+    trip geometries share one buffer of integer coordinates, indexed by the
+    ``geometry_end`` column. The files are memory-mapped, so queries only
+    touch the pages they read instead of loading the history into memory.
+
+    All methods do blocking file I/O and must run in the executor.
+    """
+
+    def __init__(self, path: Path) -> None:
+        """Initialize the archive."""
+        self._path = path
+        self._lock = threading.RLock()
+        self._maps: dict[str, tuple[mmap.mmap, memoryview]] = {}
+        self._views: dict[str, memoryview] = {}
+        self._ids: list[str] = []
+        self._index: dict[str, int] = {}
+        # Row numbers sorted by trip start
+        self._order: list[int] = []
+        self.meta: dict[str, Any] = {}
+        # Set by open and append, so the event loop can read them without
+        # waiting for the lock held during writes
+        self.newest_trip_id: str | None = None
+        self.oldest_start: int | None = None
+
+    def __len__(self) -> int:
+        """Return the number of archived trips."""
+        return len(self._ids)
+
+    def __contains__(self, trip_id: object) -> bool:
+        """Return whether a trip is archived."""
+        return trip_id in self._index
+
+    def open(self) -> None:
+        """Open the archive, creating it if needed."""
+        with self._lock:
+            self._path.mkdir(parents=True, exist_ok=True)
+            meta_file = self._path / "meta.json"
+            if meta_file.exists():
+                try:
+                    self.meta = json.loads(meta_file.read_text())
+                except ValueError:
+                    # Unreadable, e.g. from a crash of an older version
+                    self.meta = {}
+            if self.meta.get("version") != ARCHIVE_VERSION:
+                # Unknown layout, start over
+                self._truncate()
+                self.meta = {"version": ARCHIVE_VERSION}
+                self.save_meta()
+
+            self._ids = self._repair()
+            self._map_files()
+            self._index = {trip_id: row for row, trip_id in enumerate(self._ids)}
+            start = self._views["start"]
+            self._order = sorted(range(len(self._ids)), key=start.__getitem__)
+            self._update_bounds()
+
+    def close(self) -> None:
+        """Release the memory maps."""
+        with self._lock:
+            self._unmap_files()
+
+    def remove(self) -> None:
+        """Delete the archive from disk."""
+        with self._lock:
+            self._unmap_files()
+            shutil.rmtree(self._path, ignore_errors=True)
+            self._ids, self._index, self._order = [], {}, []
+            self._update_bounds()
+
+    def save_meta(self) -> None:
+        """Write the metadata (format version and sync state) atomically."""
+        with self._lock:
+            write_utf8_file(self._path / "meta.json", json.dumps(self.meta))
+
+    def append(self, trips: Iterable[Trip]) -> int:
+        """Append trips that are not archived yet, return how many were added."""
+        with self._lock:
+            new_trips = [trip for trip in trips if trip.tripId not in self._index]
+            if not new_trips:
+                return 0
+
+            columns = {name: array(code) for name, code in COLUMNS.items()}
+            coords = array(COORDS_TYPECODE)
+            geometry_end = self._views["geometry_end"]
+            base = geometry_end[-1] if len(geometry_end) else 0
+            for trip in new_trips:
+                for lat, lon in (
+                    polyline.decode(trip.geometry, POLYLINE_PRECISION)
+                    if trip.geometry
+                    else []
+                ):
+                    coords.append(round(lat * COORD_SCALE))
+                    coords.append(round(lon * COORD_SCALE))
+                scores = trip.tripScores.scores if trip.tripScores else None
+                columns["start"].append(trip.tripStartTimestampUtc)
+                columns["end"].append(trip.tripEndTimestampUtc)
+                columns["kilometers"].append(trip.kilometers)
+                columns["seconds"].append(trip.seconds)
+                columns["score"].append(trip.tripScore)
+                for name in (*SUB_SCORES, "payd"):
+                    columns[name].append(
+                        getattr(scores, name) if scores is not None else math.nan
+                    )
+                columns["geometry_end"].append(base + len(coords) // 2)
+
+            # Data first and IDs last, so an interrupted write leaves no
+            # half-written rows behind (see open)
+            self._unmap_files()
+            with (self._path / f"{COORDS}.bin").open("ab") as file:
+                coords.tofile(file)
+            for name, values in columns.items():
+                with (self._path / f"{name}.bin").open("ab") as file:
+                    values.tofile(file)
+            with (self._path / "ids.txt").open("a") as file:
+                file.writelines(f"{trip.tripId}\n" for trip in new_trips)
+            self._map_files()
+
+            start = self._views["start"]
+            for trip in new_trips:
+                row = len(self._ids)
+                self._ids.append(trip.tripId)
+                self._index[trip.tripId] = row
+                bisect.insort(self._order, row, key=start.__getitem__)
+            self._update_bounds()
+            return len(new_trips)
+
+    def summary(self, trip_id: str) -> TripSummary | None:
+        """Return the scalar data of a trip."""
+        with self._lock:
+            row = self._index.get(trip_id)
+            return self._summary(row) if row is not None else None
+
+    def trips_between(
+        self, start: int | None = None, end: int | None = None
+    ) -> list[TripSummary]:
+        """Return the trips that started in [start, end) (ms, UTC), newest first."""
+        with self._lock:
+            return [self._summary(row) for row in reversed(self._rows(start, end))]
+
+    def average(
+        self, column: str, start: int | None = None, end: int | None = None
+    ) -> float | None:
+        """Return the distance-weighted average of a score column."""
+        with self._lock:
+            values = self._views[column]
+            kilometers = self._views["kilometers"]
+            total = weight = 0.0
+            for row in self._rows(start, end):
+                if not math.isnan(value := values[row]):
+                    total += value * kilometers[row]
+                    weight += kilometers[row]
+            return total / weight if weight else None
+
+    def total(
+        self,
+        column: str,
+        start: int | None = None,
+        end: int | None = None,
+        first_row: int = 0,
+    ) -> float:
+        """
+        Return the sum of a column over the trips that started in [start, end).
+
+        With first_row, only trips appended from that row on are summed.
+        """
+        with self._lock:
+            values = self._views[column]
+            return math.fsum(
+                value
+                for row in self._rows(start, end)
+                if row >= first_row and not math.isnan(value := values[row])
+            )
+
+    def start_range(self, first_row: int = 0) -> tuple[int, int] | None:
+        """Return the earliest and latest start of the trips appended from a row on."""
+        with self._lock:
+            if first_row >= len(self._ids):
+                return None
+            starts = self._views["start"][first_row : len(self._ids)]
+            return min(starts), max(starts)
+
+    def geometry(self, trip_id: str) -> list[tuple[float, float]] | None:
+        """Return the decoded geometry of a trip."""
+        with self._lock:
+            row = self._index.get(trip_id)
+            if row is None:
+                return None
+            geometry_end = self._views["geometry_end"]
+            first = geometry_end[row - 1] if row else 0
+            coords = self._views[COORDS][first * 2 : geometry_end[row] * 2]
+            return [
+                (coords[i] / COORD_SCALE, coords[i + 1] / COORD_SCALE)
+                for i in range(0, len(coords), 2)
+            ]
+
+    def _update_bounds(self) -> None:
+        """Update the newest trip ID and the oldest start (ms, UTC)."""
+        if self._order:
+            self.newest_trip_id = self._ids[self._order[-1]]
+            self.oldest_start = self._views["start"][self._order[0]]
+        else:
+            self.newest_trip_id = self.oldest_start = None
+
+    def _rows(self, start: int | None, end: int | None) -> list[int]:
+        """Return the rows that started in [start, end), oldest first."""
+        key = self._views["start"].__getitem__
+        low = 0 if start is None else bisect.bisect_left(self._order, start, key=key)
+        high = (
+            len(self._order)
+            if end is None
+            else bisect.bisect_left(self._order, end, key=key)
+        )
+        return self._order[low:high]
+
+    def _summary(self, row: int) -> TripSummary:
+        views = self._views
+        return TripSummary(
+            trip_id=self._ids[row],
+            start=views["start"][row],
+            end=views["end"][row],
+            kilometers=_float(views["kilometers"][row]) or 0.0,
+            seconds=views["seconds"][row],
+            score=_float(views["score"][row]) or 0.0,
+            speeding=_float(views["speeding"][row]),
+            harsh_braking=_float(views["harsh_braking"][row]),
+            harsh_acceleration=_float(views["harsh_acceleration"][row]),
+            harsh_cornering=_float(views["harsh_cornering"][row]),
+            payd=_float(views["payd"][row]),
+        )
+
+    def _repair(self) -> list[str]:
+        """Drop the rows of an interrupted write, return the trip IDs."""
+        ids_file = self._path / "ids.txt"
+        ids = ids_file.read_text().splitlines() if ids_file.exists() else []
+        rows = min(
+            len(ids), *(self._file_items(name, code) for name, code in COLUMNS.items())
+        )
+        for name, code in COLUMNS.items():
+            self._truncate_file(name, code, rows)
+        if len(ids) > rows:
+            ids = ids[:rows]
+            ids_file.write_text("".join(f"{trip_id}\n" for trip_id in ids))
+
+        points = 0
+        if rows:
+            itemsize = array(COLUMNS["geometry_end"]).itemsize
+            with (self._path / "geometry_end.bin").open("rb") as file:
+                file.seek((rows - 1) * itemsize)
+                points = array(COLUMNS["geometry_end"], file.read(itemsize))[0]
+        self._truncate_file(COORDS, COORDS_TYPECODE, points * 2)
+        return ids
+
+    def _file_items(self, name: str, code: str) -> int:
+        """Return the number of complete values in a column file."""
+        file = self._path / f"{name}.bin"
+        return file.stat().st_size // array(code).itemsize if file.exists() else 0
+
+    def _truncate_file(self, name: str, code: str, items: int) -> None:
+        """Cut a column file down to a number of values."""
+        file = self._path / f"{name}.bin"
+        size = items * array(code).itemsize
+        if file.exists() and file.stat().st_size > size:
+            with file.open("r+b") as handle:
+                handle.truncate(size)
+
+    def _truncate(self) -> None:
+        """Delete all data files."""
+        for file in self._path.glob("*.bin"):
+            file.unlink()
+        (self._path / "ids.txt").unlink(missing_ok=True)
+
+    def _map_files(self) -> None:
+        """Memory-map all column files."""
+        for name, code in (*COLUMNS.items(), (COORDS, COORDS_TYPECODE)):
+            file = self._path / f"{name}.bin"
+            size = self._file_items(name, code) * array(code).itemsize
+            if not size:
+                self._views[name] = memoryview(array(code))
+                continue
+            with file.open("rb") as handle:
+                mapped = mmap.mmap(handle.fileno(), size, access=mmap.ACCESS_READ)
+            raw = memoryview(mapped)
+            self._maps[name] = (mapped, raw)
+            self._views[name] = raw.cast(code)
+
+    def _unmap_files(self) -> None:
+        """Release all memory maps."""
+        for view in self._views.values():
+            view.release()
+        self._views = {}
+        for mapped, raw in self._maps.values():
+            raw.release()
+            mapped.close()
+        self._maps = {}
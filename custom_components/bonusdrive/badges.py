@@ -0,0 +1,264 @@
+"""Badge history for bonusdrive."""
+
+from __future__ import annotations
+
+from collections import Counter
+from datetime import UTC, date, datetime, timedelta
+from typing import TYPE_CHECKING, TypedDict
+
+from homeassistant.helpers.storage import Store
+
+from .api import BonusdriveApiClientError
+from .const import DOMAIN, LOGGER
+
+if TYPE_CHECKING:
+    from allianz_bonusdrive_client import Badge
+    from homeassistant.core import HomeAssistant
+
+    from .api import BonusdriveApiClient
+
+STORAGE_VERSION = 1
+SAVE_DELAY = 60
+
+BADGE_TYPES = ("daily", "monthly")
+# Days per request when downloading past badges
+BACKFILL_DAYS = {"daily": 90, "monthly": 365}
+BACKFILL_REQUESTS_PER_RUN = 2
+# Badges older than this aren't downloaded
+BACKFILL_LIMIT = timedelta(days=5 * 365)
+# Ranges without badges in a row after which the account didn't exist yet; a
+# single one may just be a long break from driving
+BACKFILL_EMPTY_RANGES = 4
+# Daily badge levels that count as medal: gold, silver and bronze
+MEDAL_LEVELS = frozenset({1, 2, 3})
+
+
+class StoredBadge(TypedDict):
+    """A badge in the history."""
+
+    level: int
+    points: int
+    state: str
+
+
+class BackfillState(TypedDict):
+    """How far past badges have been downloaded."""
+
+    # First day of the oldest period requested so far
+    oldest: str
+    complete: bool
+    # Ranges without badges in a row, up to the oldest one
+    empty: int
+
+
+class BadgeHistoryData(TypedDict):
+    """Stored badges, keyed by type and period (YYYY-MM-DD or YYYY-MM)."""
+
+    badges: dict[str, dict[str, StoredBadge]]
+    # Badge type -> first day whose badge may still change
+    open_from: dict[str, str]
+    backfill: dict[str, BackfillState]
+
+
+class BadgeStats(TypedDict):
+    """Statistics over the daily badges."""
+
+    # Daily medals in a row, up to the newest badge
+    streak: int
+    streak_start: str | None
+    best_streak: int
+    # Badge level -> number of daily badges this month
+    month_levels: dict[int, int]
+    # Medals this month, last month up to the same day and all of last month
+    month_medals: int
+    previous_month_medals_to_date: int
+    previous_month_medals: int
+
+
+def period_key(badge_type: str, day: date) -> str:
+    """Return the history key of the period containing a day."""
+    return day.isoformat() if badge_type == "daily" else day.strftime("%Y-%m")
+
+
+def period_start(badge_type: str, day: date) -> date:
+    """Return the first day of the period containing a day."""
+    return day if badge_type == "daily" else day.replace(day=1)
+
+
+def badge_day(badge: Badge) -> date:
+    """Return the day of a badge."""
+    return datetime.fromtimestamp(badge.date / 1000, tz=UTC).date()
+
+
+class BonusdriveBadgeHistory:
+    """
+    Daily and monthly badges of an account, indexed by date.
+
+    Past badges are downloaded once, in wide date ranges, a few requests at a
+    time. Afterwards each update only requests the periods that may still
+    change: the current day or month, plus the previous one after it rolled
+    over, so its final badge is recorded.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize the badge history."""
+        self._store: Store[BadgeHistoryData] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}.badges", private=True
+        )
+        self._data = BadgeHistoryData(
+            badges={badge_type: {} for badge_type in BADGE_TYPES},
+            open_from={},
+            backfill={},
+        )
+        # Bumped on every change, invalidates the statistics
+        self._revision = 0
+        self._stats: tuple[tuple[int, date], BadgeStats] | None = None
+
+    @property
+    def backfill_complete(self) -> bool:
+        """Return whether all past badges have been downloaded."""
+        return all(
+            self._data["backfill"].get(badge_type, {}).get("complete", False)
+            for badge_type in BADGE_TYPES
+        )
+
+    async def async_load(self) -> None:
+        """Load the stored badges."""
+        if data := await self._store.async_load():
+            self._data = data
+            for state in data["backfill"].values():
+                if "empty" not in state:
+                    # Stored before empty ranges were counted, when the first
+                    # one ended the backfill
+                    state["empty"] = 0
+                    state["complete"] = False
+
+    async def async_remove(self) -> None:
+        """Remove the stored badges."""
+        await self._store.async_remove()
+
+    async def async_update(
+        self, client: BonusdriveApiClient, badge_type: str, today: date
+    ) -> Badge | None:
+        """Fetch the badges that may have changed, return the current one."""
+        start = period_start(badge_type, today)
+        open_from = self._data["open_from"].get(badge_type)
+        # One request covers the current period and any that closed since
+        first = min(date.fromisoformat(open_from), start) if open_from else start
+        badges = await client.async_get_badges(
+            badge_type=badge_type,
+            start_date=first.isoformat(),
+            end_date=today.isoformat(),
+        )
+        self._add(badge_type, badges)
+        self._data["open_from"][badge_type] = start.isoformat()
+        self._data["backfill"].setdefault(
+            badge_type, BackfillState(oldest=first.isoformat(), complete=False, empty=0)
+        )
+        self._async_schedule_save()
+
+        newest = max(badges, key=lambda badge: badge.date, default=None)
+        if (
+            newest is not None
+            and first < start
+            and period_key(badge_type, badge_day(newest))
+            < period_key(badge_type, start)
+        ):
+            # Only periods that just closed have a badge
+            return None
+        return newest
+
+    async def async_backfill(self, client: BonusdriveApiClient, today: date) -> None:
+        """Download a bounded number of ranges of older badges."""
+        for badge_type in BADGE_TYPES:
+            state = self._data["backfill"].get(badge_type)
+            # Starts once the current period has been fetched
+            if state is None or state["complete"]:
+                continue
+            for _ in range(BACKFILL_REQUESTS_PER_RUN):
+                end = date.fromisoformat(state["oldest"]) - timedelta(days=1)
+                start = period_start(
+                    badge_type, end - timedelta(days=BACKFILL_DAYS[badge_type] - 1)
+                )
+                try:
+                    badges = await client.async_get_badges(
+                        badge_type=badge_type,
+                        start_date=start.isoformat(),
+                        end_date=end.isoformat(),
+                    )
+                except BonusdriveApiClientError as exception:
+                    LOGGER.debug("Badge history backfill interrupted: %s", exception)
+                    break
+                self._add(badge_type, badges)
+                state["oldest"] = start.isoformat()
+                state["empty"] = 0 if badges else state["empty"] + 1
+                state["complete"] = (
+                    state["empty"] >= BACKFILL_EMPTY_RANGES
+                    or start <= today - BACKFILL_LIMIT
+                )
+                if state["complete"]:
+                    break
+            LOGGER.debug(
+                "Badge history has %s %s badges (complete: %s)",
+                len(self._data["badges"][badge_type]),
+                badge_type,
+                state["complete"],
+            )
+        self._async_schedule_save()
+
+    def stats(self, today: date) -> BadgeStats:
+        """Return streak and medal counts of the daily badges."""
+        key = (self._revision, today)
+        if self._stats is None or self._stats[0] != key:
+            self._stats = (key, self._compute_stats(today))
+        return self._stats[1]
+
+    def _compute_stats(self, today: date) -> BadgeStats:
+        daily = sorted(self._data["badges"]["daily"].items())
+
+        # Days without a badge (no driving) don't break a streak
+        streak = best_streak = 0
+        streak_start: str | None = None
+        for day, badge in daily:
+            if badge["level"] in MEDAL_LEVELS:
+                if not streak:
+                    streak_start = day
+                streak += 1
+                best_streak = max(best_streak, streak)
+            else:
+                streak, streak_start = 0, None
+
+        month = today.strftime("%Y-%m")
+        previous_month = (today.replace(day=1) - timedelta(days=1)).strftime("%Y-%m")
+        month_levels: Counter[int] = Counter()
+        previous_to_date = previous_total = 0
+        for day, badge in daily:
+            if day.startswith(month):
+                month_levels[badge["level"]] += 1
+            elif day.startswith(previous_month) and badge["level"] in MEDAL_LEVELS:
+                previous_total += 1
+                if int(day[8:]) <= today.day:
+                    previous_to_date += 1
+
+        return BadgeStats(
+            streak=streak,
+            streak_start=streak_start,
+            best_streak=best_streak,
+            month_levels=dict(month_levels),
+            month_medals=sum(month_levels[level] for level in MEDAL_LEVELS),
+            previous_month_medals_to_date=previous_to_date,
+            previous_month_medals=previous_total,
+        )
+
+    def _add(self, badge_type: str, badges: list[Badge]) -> None:
+        """Index badges by period."""
+        index = self._data["badges"][badge_type]
+        for badge in badges:
+            index[period_key(badge_type, badge_day(badge))] = StoredBadge(
+                level=badge.level, points=badge.pointsAwarded, state=badge.state
+            )
+        self._revision += 1
+
+    def _async_schedule_save(self) -> None:
+        """Save the history soon, batching the writes of several updates."""
+        self._store.async_delay_save(lambda: self._data, SAVE_DELAY)
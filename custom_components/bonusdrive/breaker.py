@@ -0,0 +1,145 @@
+"""Circuit breaker for the BonusDrive API."""
+
+from __future__ import annotations
+
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+from enum import StrEnum
+from typing import TYPE_CHECKING
+
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    BREAKER_BACKOFF_MAX,
+    BREAKER_BACKOFF_MIN,
+    BREAKER_JITTER,
+    BREAKER_THRESHOLD,
+    LOGGER,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
+    from datetime import datetime
+
+
+# Breakers that counted a failure in the current batch, inherited by the tasks
+# started from it
+_BATCH: ContextVar[set[CircuitBreaker] | None] = ContextVar(
+    "bonusdrive_breaker_batch", default=None
+)
+
+
+class BreakerState(StrEnum):
+    """State of the circuit breaker."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Stop polling the API while it keeps failing.
+
+    After a number of consecutive failed refreshes (or calls outside of one)
+    the breaker opens and every call fails without a request. Once the backoff
+    has passed it is half-open and a single call decides whether to close it
+    again or to open it for twice as long, up to a maximum. The backoff is
+    jittered so installations don't all come back at the same moment after an
+    outage.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the breaker."""
+        self.failures = 0
+        # Consecutive times the breaker opened, drives the backoff
+        self.trips = 0
+        self.retry_at: datetime | None = None
+        self._listeners: list[Callable[[], None]] = []
+        # Whether the single call of the half-open state is in flight
+        self._probing = False
+
+    @property
+    def state(self) -> BreakerState:
+        """Return the current state."""
+        if self.retry_at is None:
+            return BreakerState.CLOSED
+        if dt_util.utcnow() < self.retry_at:
+            return BreakerState.OPEN
+        return BreakerState.HALF_OPEN
+
+    def async_add_listener(self, listener: Callable[[], None]) -> Callable[[], None]:
+        """Listen for state changes, return a function to stop listening."""
+        self._listeners.append(listener)
+        return lambda: self._listeners.remove(listener)
+
+    def allow_request(self) -> bool:
+        """Return whether a call may go out, and claim the probe if half-open."""
+        state = self.state
+        if state is BreakerState.CLOSED:
+            return True
+        if state is BreakerState.OPEN or self._probing:
+            return False
+        self._probing = True
+        return True
+
+    def release_probe(self) -> None:
+        """Let the next call probe after one that proved nothing either way."""
+        self._probing = False
+
+    @staticmethod
+    @contextmanager
+    def batch() -> Iterator[None]:
+        """
+        Count the failed calls of a block, e.g. a refresh, as one failure.
+
+        This includes calls of tasks started in the block, like the history
+        backfill of a refresh.
+        """
+        token = _BATCH.set(set())
+        try:
+            yield
+        finally:
+            _BATCH.reset(token)
+
+    def record_success(self) -> None:
+        """Close the breaker after a successful call."""
+        self._probing = False
+        if not self.failures and self.retry_at is None:
+            return
+        if self.retry_at is not None:
+            LOGGER.info("BonusDrive API is reachable again")
+        self.failures = 0
+        self.trips = 0
+        self.retry_at = None
+        self._notify()
+
+    def record_failure(self) -> None:
+        """Count a failed call, open the breaker if there were too many."""
+        self._probing = False
+        if (batch := _BATCH.get()) is not None:
+            if self in batch:
+                return
+            batch.add(self)
+        self.failures += 1
+        if self.state is BreakerState.OPEN or (
+            self.state is BreakerState.CLOSED and self.failures < BREAKER_THRESHOLD
+        ):
+            self._notify()
+            return
+
+        backoff = min(BREAKER_BACKOFF_MIN * 2**self.trips, BREAKER_BACKOFF_MAX)
+        backoff *= random.uniform(1 - BREAKER_JITTER, 1)  # noqa: S311 Not used for cryptography
+        self.trips += 1
+        self.retry_at = dt_util.utcnow() + backoff
+        LOGGER.warning(
+            "BonusDrive API failed %s times in a row, pausing requests until %s",
+            self.failures,
+            self.retry_at,
+        )
+        self._notify()
+
+    def _notify(self) -> None:
+        for listener in self._listeners:
+            listener()
@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 import voluptuous as vol
 from homeassistant import config_entries
@@ -16,8 +16,22 @@ from .api import (
     BonusdriveApiClientAuthenticationError,
     BonusdriveApiClientCommunicationError,
     BonusdriveApiClientError,
+    async_import_backend,
 )
-from .const import CONF_BASE_URL, CONF_PHOTON_URL, DEFAULT_BASE_URL, DOMAIN, LOGGER
+from .const import (
+    CONF_BASE_URL,
+    CONF_GEOMETRY_TOLERANCE,
+    CONF_NATIVE_TRANSPORT,
+    CONF_PHOTON_URL,
+    DEFAULT_BASE_URL,
+    DEFAULT_GEOMETRY_TOLERANCE,
+    DOMAIN,
+    LOGGER,
+)
+from .store import async_hand_over_session
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
 
 
 class BonusdriveFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
@@ -41,7 +55,7 @@ class BonusdriveFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
         _errors = {}
         if user_input is not None:
             try:
-                await self._test_credentials(
+                tgt = await self._test_credentials(
                     base_url=user_input.get(CONF_BASE_URL, DEFAULT_BASE_URL),
                     email=user_input[CONF_EMAIL],
                     password=user_input[CONF_PASSWORD],
@@ -65,6 +79,9 @@ class BonusdriveFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
                     unique_id=slugify(user_input[CONF_EMAIL])
                 )
                 self._abort_if_unique_id_configured()
+                if tgt and self.unique_id:
+                    # Saves the entry's first refresh a login
+                    async_hand_over_session(self.hass, self.unique_id, tgt)
                 return self.async_create_entry(
                     title=user_input[CONF_EMAIL],
                     data=data,
@@ -107,8 +124,64 @@ class BonusdriveFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
             errors=_errors,
         )
 
-    async def _test_credentials(self, base_url: str, email: str, password: str) -> None:
-        """Validate credentials."""
+    async def async_step_reauth(
+        self,
+        entry_data: Mapping[str, Any],  # noqa: ARG002 Unused method argument: `entry_data`
+    ) -> config_entries.ConfigFlowResult:
+        """Handle rejected credentials."""
+        return await self.async_step_reauth_confirm()
+
+    async def async_step_reauth_confirm(
+        self,
+        user_input: dict | None = None,
+    ) -> config_entries.ConfigFlowResult:
+        """Ask for the new password."""
+        _errors = {}
+        entry = self._get_reauth_entry()
+        if user_input is not None:
+            try:
+                tgt = await self._test_credentials(
+                    base_url=entry.data.get(CONF_BASE_URL, DEFAULT_BASE_URL),
+                    email=entry.data[CONF_EMAIL],
+                    password=user_input[CONF_PASSWORD],
+                )
+            except BonusdriveApiClientAuthenticationError as exception:
+                LOGGER.warning(exception)
+                _errors["base"] = "auth"
+            except BonusdriveApiClientCommunicationError as exception:
+                LOGGER.error(exception)
+                _errors["base"] = "connection"
+            except BonusdriveApiClientError as exception:
+                LOGGER.exception(exception)
+                _errors["base"] = "unknown"
+            else:
+                if tgt and entry.unique_id:
+                    async_hand_over_session(self.hass, entry.unique_id, tgt)
+                return self.async_update_reload_and_abort(
+                    entry,
+                    data_updates={CONF_PASSWORD: user_input[CONF_PASSWORD]},
+                )
+
+        return self.async_show_form(
+            step_id="reauth_confirm",
+            description_placeholders={"email": entry.data[CONF_EMAIL]},
+            data_schema=vol.Schema(
+                {
+                    vol.Required(CONF_PASSWORD): selector.TextSelector(
+                        selector.TextSelectorConfig(
+                            type=selector.TextSelectorType.PASSWORD,
+                        ),
+                    ),
+                },
+            ),
+            errors=_errors,
+        )
+
+    async def _test_credentials(
+        self, base_url: str, email: str, password: str
+    ) -> str | None:
+        """Validate credentials, return the TGT of the new session."""
+        await async_import_backend(self.hass)
         client = BonusdriveApiClient(
             hass=self.hass,
             base_url=base_url,
@@ -116,6 +189,7 @@ class BonusdriveFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
             password=password,
         )
         await client.async_authenticate()
+        return client.tgt
 
 
 class BonusdriveOptionsFlowHandler(config_entries.OptionsFlow):
@@ -149,6 +223,26 @@ class BonusdriveOptionsFlowHandler(config_entries.OptionsFlow):
                             type=selector.TextSelectorType.URL,
                         ),
                     ),
+                    vol.Optional(
+                        CONF_NATIVE_TRANSPORT,
+                        default=self.config_entry.data.get(
+                            CONF_NATIVE_TRANSPORT, False
+                        ),
+                    ): selector.BooleanSelector(),
+                    vol.Optional(
+                        CONF_GEOMETRY_TOLERANCE,
+                        default=self.config_entry.data.get(
+                            CONF_GEOMETRY_TOLERANCE, DEFAULT_GEOMETRY_TOLERANCE
+                        ),
+                    ): selector.NumberSelector(
+                        selector.NumberSelectorConfig(
+                            min=0,
+                            max=100,
+                            step=1,
+                            unit_of_measurement="m",
+                            mode=selector.NumberSelectorMode.BOX,
+                        ),
+                    ),
                 },
             ),
         )
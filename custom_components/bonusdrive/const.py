@@ -1,5 +1,6 @@
 """Constants for bonusdrive."""
 
+from datetime import timedelta
 from logging import Logger, getLogger
 
 LOGGER: Logger = getLogger(__package__)
@@ -10,4 +11,45 @@ ATTRIBUTION = "Data provided by Allianz BonusDrive"
 # Configuration constants
 CONF_BASE_URL = "base_url"
 CONF_PHOTON_URL = "photon_url"
+CONF_NATIVE_TRANSPORT = "native_transport"
+CONF_GEOMETRY_TOLERANCE = "geometry_tolerance"
 DEFAULT_BASE_URL = "https://bonusdrive.drivesync.com"
+# Max. deviation of the simplified trip route from the GPS trace (meters)
+DEFAULT_GEOMETRY_TOLERANCE = 10
+
+# Events fired on the bus
+EVENT_NEW_TRIP = f"{DOMAIN}_new_trip"
+EVENT_BADGE_CHANGED = f"{DOMAIN}_badge_changed"
+
+# Upper bound for a single API call during a coordinator refresh (seconds)
+FETCH_TIMEOUT = 60
+# Upper bound for a single request, the library has no timeout of its own
+CALL_TIMEOUT = 30
+
+# Adaptive polling: interval depending on how long ago the last trip ended
+UPDATE_INTERVAL_ACTIVE = timedelta(minutes=5)
+UPDATE_INTERVAL_DEFAULT = timedelta(minutes=15)
+UPDATE_INTERVAL_IDLE = timedelta(hours=1)
+UPDATE_INTERVAL_DORMANT = timedelta(hours=3)
+ACTIVE_PERIOD = timedelta(hours=2)
+RECENT_PERIOD = timedelta(days=1)
+DORMANT_PERIOD = timedelta(days=7)
+# Each entry polls up to this much slower than the interval, so several
+# accounts don't poll in lockstep
+POLL_STAGGER = timedelta(minutes=2)
+# Badges change far less often than trips: each type is refetched once it is
+# this old, when the day rolls over and (daily badge) after a new trip
+BADGE_MAX_AGE = {
+    "daily": timedelta(hours=1),
+    "monthly": timedelta(hours=12),
+}
+
+# API calls in flight at once, across all config entries
+MAX_CONCURRENT_CALLS = 4
+
+# Circuit breaker: consecutive failed calls before requests are paused, and the
+# pause, doubled each time the API is still down (minus up to 20% jitter)
+BREAKER_THRESHOLD = 3
+BREAKER_BACKOFF_MIN = timedelta(minutes=5)
+BREAKER_BACKOFF_MAX = timedelta(hours=3)
+BREAKER_JITTER = 0.2
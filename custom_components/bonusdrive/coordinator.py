@@ -2,19 +2,48 @@
 
 from __future__ import annotations
 
+import asyncio
 from datetime import UTC, datetime
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
+from homeassistant.core import callback
 from homeassistant.exceptions import ConfigEntryAuthFailed
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
 from .api import (
     BonusdriveApiClientAuthenticationError,
+    BonusdriveApiClientCommunicationError,
     BonusdriveApiClientError,
 )
+from .breaker import BreakerState
+from .const import (
+    ACTIVE_PERIOD,
+    BADGE_MAX_AGE,
+    DORMANT_PERIOD,
+    EVENT_BADGE_CHANGED,
+    EVENT_NEW_TRIP,
+    FETCH_TIMEOUT,
+    RECENT_PERIOD,
+    UPDATE_INTERVAL_ACTIVE,
+    UPDATE_INTERVAL_DEFAULT,
+    UPDATE_INTERVAL_DORMANT,
+    UPDATE_INTERVAL_IDLE,
+)
 from .data import BonusdriveCoordinatorData
+from .metrics import BonusdriveMetrics
+from .pool import poll_offset
+from .routes import route_url
+from .statistics import async_import_trip_statistics
 
 if TYPE_CHECKING:
+    from collections.abc import Awaitable
+    from datetime import timedelta
+    from logging import Logger
+
+    from allianz_bonusdrive_client import Badge, Trip
+    from homeassistant.core import HomeAssistant
+
+    from .api import BonusdriveApiClient
     from .data import BonusdriveConfigEntry
 
 
@@ -24,44 +53,320 @@ class BonusdriveDataUpdateCoordinator(DataUpdateCoordinator[BonusdriveCoordinato
 
     config_entry: BonusdriveConfigEntry
 
+    # Why the current update interval was chosen
+    update_interval_reason: str = "default"
+    # Slices of the data that changed in the last successful refresh
+    changed: frozenset[str] = frozenset()
+    _fingerprints: dict[str, Any] | None = None
+    _history_task: asyncio.Task | None = None
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        logger: Logger,
+        name: str,
+        update_interval: timedelta,
+    ) -> None:
+        """Initialize the coordinator."""
+        super().__init__(
+            hass=hass, logger=logger, name=name, update_interval=update_interval
+        )
+        # Duration of each refresh and of its stages
+        self.metrics = BonusdriveMetrics()
+        # Badge type -> when it was last fetched
+        self._badges_fetched: dict[str, datetime] = {}
+        # Trips found by the sync that haven't been announced yet, newest first
+        self._new_trips: list[Trip] = []
+
     async def _async_update_data(self) -> BonusdriveCoordinatorData:
         """Update data via library."""
-        try:
-            client = self.config_entry.runtime_data.client
-
-            # Fetch the last trip (basic info first to get trip ID)
-            trips = await client.async_get_trips(amount=1)
-            last_trip = None
-            if trips:
-                # Get detailed trip info including geocoded locations
-                last_trip = await client.async_get_trip_details(trips[0].tripId)
-
-            # Get current date for badge and score queries
-            today = datetime.now(tz=UTC).strftime("%Y-%m-%d")
-
-            # Fetch daily badges (get today's badge - may not exist)
-            daily_badges = await client.async_get_badges(
-                badge_type="daily",
-                start_date=today,
-                end_date=today,
-            )
-            daily_badge = daily_badges[0] if daily_badges else None
-
-            # Fetch monthly badges (get current month's badge - may not exist)
-            first_of_month = datetime.now(tz=UTC).replace(day=1).strftime("%Y-%m-%d")
-            monthly_badges = await client.async_get_badges(
-                badge_type="monthly",
-                start_date=first_of_month,
-                end_date=today,
-            )
-            monthly_badge = monthly_badges[0] if monthly_badges else None
+        # A refresh that fails counts once, however many of its calls failed
+        with (
+            self.metrics.measure("refresh"),
+            self.config_entry.runtime_data.client.breaker.batch(),
+        ):
+            return await self._async_refresh_data()
 
-            return BonusdriveCoordinatorData(
-                last_trip=last_trip,
-                daily_badge=daily_badge,
-                monthly_badge=monthly_badge,
-            )
+    async def _async_refresh_data(self) -> BonusdriveCoordinatorData:
+        """Fetch all data for a refresh."""
+        client = self.config_entry.runtime_data.client
+
+        now = datetime.now(tz=UTC)
+
+        breaker = client.breaker
+        if breaker.state is BreakerState.OPEN:
+            msg = f"Paused after repeated API errors, retrying after {breaker.retry_at}"
+            raise UpdateFailed(msg)
+
+        try:
+            if breaker.state is BreakerState.HALF_OPEN:
+                # One cheap call decides whether the full refresh is worth it
+                await self._async_fetch("probe", client.async_probe())
+            else:
+                # Authenticate once up front so the concurrent calls share a
+                # session
+                await client.async_ensure_authenticated()
         except BonusdriveApiClientAuthenticationError as exception:
             raise ConfigEntryAuthFailed(exception) from exception
         except BonusdriveApiClientError as exception:
             raise UpdateFailed(exception) from exception
+
+        history = self.config_entry.runtime_data.history
+        last_trip_result, badges = await self._async_fetch_trip_and_badges(client, now)
+
+        results = [last_trip_result, *badges.values()]
+        errors = [result for result in results if isinstance(result, BaseException)]
+        for error in errors:
+            if isinstance(error, BonusdriveApiClientAuthenticationError):
+                raise ConfigEntryAuthFailed(error) from error
+            if not isinstance(error, BonusdriveApiClientError):
+                raise error
+        if len(errors) == len(results):
+            raise UpdateFailed(errors[0]) from errors[0]
+
+        previous = self.data or BonusdriveCoordinatorData()
+
+        # Needs the trip sync above to know whether the current periods changed
+        try:
+            period_scores = await self._async_fetch(
+                "period scores",
+                self.config_entry.runtime_data.scores.async_update(
+                    client,
+                    now.date(),
+                    history.newest_trip_id,
+                ),
+            )
+        except BonusdriveApiClientAuthenticationError as exception:
+            raise ConfigEntryAuthFailed(exception) from exception
+        except BonusdriveApiClientError:
+            period_scores = previous.period_scores
+
+        last_trip = self._partial(last_trip_result, previous.last_trip)
+        data = BonusdriveCoordinatorData(
+            last_trip=last_trip,
+            last_trip_geometry=client.trip_geometry(last_trip.tripId)
+            if last_trip
+            else None,
+            daily_badge=self._partial(
+                badges.get("daily", previous.daily_badge), previous.daily_badge
+            ),
+            monthly_badge=self._partial(
+                badges.get("monthly", previous.monthly_badge), previous.monthly_badge
+            ),
+            period_scores=period_scores,
+            badge_stats=self.config_entry.runtime_data.badges.stats(now.date()),
+        )
+        self._adapt_update_interval(data.last_trip, now)
+        self._detect_changes(data)
+        self._fire_events(previous, data)
+
+        if self._history_task is None or self._history_task.done():
+            self._history_task = self.config_entry.async_create_background_task(
+                self.hass,
+                self._async_update_history(client),
+                "bonusdrive trip history",
+            )
+        return data
+
+    async def _async_update_history(self, client: BonusdriveApiClient) -> None:
+        """Backfill older trips and badges, import new trips into statistics."""
+        history = self.config_entry.runtime_data.history
+        if not history.backfill_complete:
+            # Older trips are synced a few pages per refresh
+            with self.metrics.measure("history_backfill"):
+                await history.async_backfill(client)
+        badges = self.config_entry.runtime_data.badges
+        if not badges.backfill_complete:
+            with self.metrics.measure("badge_backfill"):
+                await badges.async_backfill(client, datetime.now(tz=UTC).date())
+        with self.metrics.measure("statistics_import"):
+            await async_import_trip_statistics(self.hass, self.config_entry, history)
+
+    def _adapt_update_interval(self, last_trip: Trip | None, now: datetime) -> None:
+        """
+        Poll often right after a trip and back off while the car is idle.
+
+        Trips are uploaded after they end and are often followed by a return
+        trip, so the hours after the last trip are the most likely to bring
+        new data.
+        """
+        if last_trip is None:
+            interval, reason = UPDATE_INTERVAL_IDLE, "no_trips"
+        else:
+            idle = now - datetime.fromtimestamp(
+                last_trip.tripEndTimestampUtc / 1000, tz=UTC
+            )
+            if idle < ACTIVE_PERIOD:
+                interval, reason = UPDATE_INTERVAL_ACTIVE, "recent_trip"
+            elif idle < RECENT_PERIOD:
+                interval, reason = UPDATE_INTERVAL_DEFAULT, "recent_activity"
+            elif idle < DORMANT_PERIOD:
+                interval, reason = UPDATE_INTERVAL_IDLE, "idle"
+            else:
+                interval, reason = UPDATE_INTERVAL_DORMANT, "dormant"
+
+        interval += poll_offset(self.config_entry.entry_id)
+        if interval != self.update_interval:
+            self.logger.debug("Changing update interval to %s (%s)", interval, reason)
+        self.update_interval = interval
+        self.update_interval_reason = reason
+
+    def _detect_changes(self, data: BonusdriveCoordinatorData) -> None:
+        """
+        Record which slices of the data differ from the previous refresh.
+
+        Entities only write their state when their slice changed, so a quiet
+        refresh doesn't produce a state write (and recorder row) per entity.
+        """
+        fingerprints = data.fingerprints()
+        fingerprints["update_interval"] = (
+            self.update_interval,
+            self.update_interval_reason,
+        )
+        previous = self._fingerprints
+        self.changed = frozenset(
+            key
+            for key, value in fingerprints.items()
+            if previous is None or previous.get(key) != value
+        )
+        self._fingerprints = fingerprints
+
+    @callback
+    def _fire_events(
+        self, previous: BonusdriveCoordinatorData, data: BonusdriveCoordinatorData
+    ) -> None:
+        """Announce new trips and changed badge levels on the event bus."""
+        entry_id = self.config_entry.entry_id
+        # Oldest first, when a sync caught up on several trips
+        for trip in reversed(self._new_trips):
+            self.hass.bus.async_fire(
+                EVENT_NEW_TRIP,
+                {
+                    "config_entry_id": entry_id,
+                    "trip_id": trip.tripId,
+                    "start": datetime.fromtimestamp(
+                        trip.tripStartTimestampUtc / 1000, tz=UTC
+                    ).isoformat(),
+                    "end": datetime.fromtimestamp(
+                        trip.tripEndTimestampUtc / 1000, tz=UTC
+                    ).isoformat(),
+                    "distance": trip.kilometers,
+                    "duration": trip.seconds,
+                    "score": trip.tripScore,
+                    "route_url": route_url(entry_id, trip.tripId),
+                },
+            )
+        self._new_trips.clear()
+
+        if self.data is None:
+            # Nothing to compare the first badges with
+            return
+        for badge_type, old, new in (
+            ("daily", previous.daily_badge, data.daily_badge),
+            ("monthly", previous.monthly_badge, data.monthly_badge),
+        ):
+            if new is None or (old is not None and old.level == new.level):
+                continue
+            self.hass.bus.async_fire(
+                EVENT_BADGE_CHANGED,
+                {
+                    "config_entry_id": entry_id,
+                    "badge_type": badge_type,
+                    "level": new.level,
+                    "previous_level": old.level if old is not None else None,
+                    "points": new.pointsAwarded,
+                    "date": datetime.fromtimestamp(new.date / 1000, tz=UTC)
+                    .date()
+                    .isoformat(),
+                },
+            )
+
+    async def _async_fetch_last_trip(self, client: BonusdriveApiClient) -> Trip | None:
+        """Fetch the last trip, including geocoded details."""
+        # Sync new trips into the history (basic info first to get trip ID)
+        history = self.config_entry.runtime_data.history
+        known = len(history) > 0
+        new_trips = await history.async_sync(client)
+        if known:
+            # Without any history the trips found aren't new, just unknown
+            self._new_trips[:0] = new_trips
+        if (trip_id := history.newest_trip_id) is None:
+            return None
+        # Get detailed trip info including geocoded locations
+        return await client.async_get_trip_details(trip_id)
+
+    async def _async_fetch[T](self, name: str, awaitable: Awaitable[T]) -> T:
+        """Await a single API call, bounded by the per-call timeout."""
+        try:
+            with self.metrics.measure(name.replace(" ", "_")):
+                async with asyncio.timeout(FETCH_TIMEOUT):
+                    return await awaitable
+        except TimeoutError as exception:
+            # The calls record their own timeouts in the breaker
+            msg = f"Timed out fetching {name}"
+            self.logger.warning(msg)
+            raise BonusdriveApiClientCommunicationError(msg) from exception
+        except BonusdriveApiClientCommunicationError as exception:
+            self.logger.warning("Error fetching %s: %s", name, exception)
+            raise
+
+    async def _async_fetch_trip_and_badges(
+        self, client: BonusdriveApiClient, now: datetime
+    ) -> tuple[Trip | None | BaseException, dict[str, Badge | None | BaseException]]:
+        """
+        Fetch the last trip and the badges that may have changed.
+
+        The badge queries don't depend on the trip chain, so they run
+        concurrently. Each call gets its own timeout and a failure only
+        affects its own slice of the data. Badges change far less often than
+        trips, so a badge type that can't have changed since it was fetched
+        is left out.
+        """
+        newest_trip_id = self.config_entry.runtime_data.history.newest_trip_id
+        due = [
+            badge_type
+            for badge_type, max_age in BADGE_MAX_AGE.items()
+            if self._badge_due(badge_type, max_age, now)
+        ]
+        last_trip_result, *badge_results = await asyncio.gather(
+            self._async_fetch("last trip", self._async_fetch_last_trip(client)),
+            *(self._async_fetch_badge(client, badge_type, now) for badge_type in due),
+            return_exceptions=True,
+        )
+        badges = dict(zip(due, badge_results, strict=True))
+        if (
+            "daily" not in badges
+            and self.config_entry.runtime_data.history.newest_trip_id != newest_trip_id
+        ):
+            # A new trip most likely changed today's badge
+            try:
+                badges["daily"] = await self._async_fetch_badge(client, "daily", now)
+            except BonusdriveApiClientError as exception:
+                badges["daily"] = exception
+        return last_trip_result, badges
+
+    async def _async_fetch_badge(
+        self, client: BonusdriveApiClient, badge_type: str, now: datetime
+    ) -> Badge | None:
+        """Fetch today's daily or this month's monthly badge (may not exist)."""
+        badge = await self._async_fetch(
+            f"{badge_type} badge",
+            self.config_entry.runtime_data.badges.async_update(
+                client, badge_type, now.date()
+            ),
+        )
+        self._badges_fetched[badge_type] = now
+        return badge
+
+    def _badge_due(self, badge_type: str, max_age: timedelta, now: datetime) -> bool:
+        """Return whether a badge may have changed since it was fetched."""
+        if (fetched := self._badges_fetched.get(badge_type)) is None:
+            return True
+        return fetched.date() != now.date() or now - fetched >= max_age
+
+    @staticmethod
+    def _partial[T](result: T | BaseException, previous: T) -> T:
+        """Keep the previous value if this part of the refresh failed."""
+        if isinstance(result, BaseException):
+            return previous
+        return result
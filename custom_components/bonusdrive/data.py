@@ -2,8 +2,10 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import TYPE_CHECKING
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+from .scores import PERIODS
 
 if TYPE_CHECKING:
     from allianz_bonusdrive_client import Badge, Trip
@@ -11,7 +13,11 @@ if TYPE_CHECKING:
     from homeassistant.loader import Integration
 
     from .api import BonusdriveApiClient
+    from .badges import BadgeStats, BonusdriveBadgeHistory
     from .coordinator import BonusdriveDataUpdateCoordinator
+    from .geometry import TripGeometry
+    from .history import BonusdriveTripHistory
+    from .scores import BonusdrivePeriodScores, PeriodScore
 
 
 type BonusdriveConfigEntry = ConfigEntry[BonusdriveData]
@@ -24,6 +30,9 @@ class BonusdriveData:
     client: BonusdriveApiClient
     coordinator: BonusdriveDataUpdateCoordinator
     integration: Integration
+    history: BonusdriveTripHistory
+    scores: BonusdrivePeriodScores
+    badges: BonusdriveBadgeHistory
 
 
 @dataclass
@@ -31,5 +40,33 @@ class BonusdriveCoordinatorData:
     """Data returned by the coordinator."""
 
     last_trip: Trip | None = None
+    last_trip_geometry: TripGeometry | None = None
     daily_badge: Badge | None = None
     monthly_badge: Badge | None = None
+    # Current and previous week, month and year, see BonusdrivePeriodScores
+    period_scores: dict[str, PeriodScore] = field(default_factory=dict)
+    # Streak and medal counts, see BonusdriveBadgeHistory
+    badge_stats: BadgeStats | None = None
+
+    def fingerprints(self) -> dict[str, Any]:
+        """Return the values that identify the state of each slice of the data."""
+        return {
+            "last_trip": self.last_trip.tripId if self.last_trip else None,
+            "daily_badge": badge_fingerprint(self.daily_badge),
+            "monthly_badge": badge_fingerprint(self.monthly_badge),
+            "badge_stats": self.badge_stats,
+            **{
+                f"{period}_score": (
+                    self.period_scores.get(period),
+                    self.period_scores.get(f"previous_{period}"),
+                )
+                for period in PERIODS
+            },
+        }
+
+
+def badge_fingerprint(badge: Badge | None) -> tuple[Any, ...] | None:
+    """Return the values that identify the state of a badge."""
+    if badge is None:
+        return None
+    return (badge.badgeType, badge.date, badge.level, badge.state, badge.pointsAwarded)
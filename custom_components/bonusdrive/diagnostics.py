@@ -0,0 +1,58 @@
+"""Diagnostics support for bonusdrive."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.const import CONF_EMAIL, CONF_PASSWORD
+
+from .geocode import async_get_geocode_cache
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+    from .data import BonusdriveConfigEntry
+
+TO_REDACT = {CONF_EMAIL, CONF_PASSWORD}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: BonusdriveConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    client = entry.runtime_data.client
+    coordinator = entry.runtime_data.coordinator
+    history = entry.runtime_data.history
+    geocode_cache = await async_get_geocode_cache(hass)
+    return {
+        "entry": async_redact_data(entry.data, TO_REDACT),
+        "coordinator": {
+            "last_update_success": coordinator.last_update_success,
+            "update_interval": coordinator.update_interval.total_seconds()
+            if coordinator.update_interval
+            else None,
+            "update_interval_reason": coordinator.update_interval_reason,
+        },
+        "breaker": {
+            "state": client.breaker.state.value,
+            "failures": client.breaker.failures,
+            "retry_at": client.breaker.retry_at.isoformat()
+            if client.breaker.retry_at
+            else None,
+        },
+        "caches": {
+            "trip_details_hits": client.trip_details_cache_hits,
+            "trip_details_misses": client.trip_details_cache_misses,
+            "geocode_hits": geocode_cache.hits,
+            "geocode_misses": geocode_cache.misses,
+        },
+        "history": {
+            "trips": len(history),
+            "backfill_complete": history.backfill_complete,
+        },
+        # Per library method, plus Photon lookups
+        "endpoints": client.metrics.as_dict(),
+        # Per refresh stage
+        "stages": coordinator.metrics.as_dict(),
+    }
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from homeassistant.core import callback
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
@@ -15,6 +16,10 @@ class BonusdriveEntity(CoordinatorEntity[BonusdriveDataUpdateCoordinator]):
     _attr_attribution = ATTRIBUTION
     _attr_has_entity_name = True
 
+    # Slice of the coordinator data the state depends on (None: all of it)
+    _data_slice: str | None = None
+    _written_available: bool | None = None
+
     def __init__(self, coordinator: BonusdriveDataUpdateCoordinator) -> None:
         """Initialize."""
         super().__init__(coordinator)
@@ -30,3 +35,16 @@ class BonusdriveEntity(CoordinatorEntity[BonusdriveDataUpdateCoordinator]):
             manufacturer="Allianz",
             model="BonusDrive",
         )
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the state only if the slice of data it depends on changed."""
+        available = self.available
+        if (
+            self._data_slice is not None
+            and self._data_slice not in self.coordinator.changed
+            and available == self._written_available
+        ):
+            return
+        self._written_available = available
+        super()._handle_coordinator_update()
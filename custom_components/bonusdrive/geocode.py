@@ -0,0 +1,148 @@
+"""Reverse geocoding cache for Photon lookups."""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from contextlib import nullcontext
+from datetime import timedelta
+from typing import TYPE_CHECKING, Any, TypedDict
+
+from homeassistant.helpers.singleton import singleton
+from homeassistant.helpers.storage import Store
+from homeassistant.util.hass_dict import HassKey
+
+from .const import DOMAIN
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+    from .metrics import BonusdriveMetrics
+
+STORAGE_VERSION = 1
+SAVE_DELAY = 60
+
+# 4 decimals are roughly 11 m, close enough for a parking spot
+GEOCODE_PRECISION = 4
+GEOCODE_CACHE_SIZE = 1000
+GEOCODE_TTL = timedelta(days=90)
+
+DATA_GEOCODE_CACHE: HassKey[GeocodeCache] = HassKey(f"{DOMAIN}_geocode_cache")
+
+
+class GeocodeData(TypedDict):
+    """Stored geocoding cache, least recently used first."""
+
+    entries: list[tuple[str, dict[str, Any], float]]
+
+
+def _trim(response: dict[str, Any]) -> dict[str, Any]:
+    """Keep only the properties of the first feature of a Photon response."""
+    features = response.get("features") or []
+    if not features or not isinstance(features, list) or not features[0]:
+        return {"features": []}
+    return {"features": [{"properties": features[0].get("properties") or {}}]}
+
+
+class GeocodeCache:
+    """
+    LRU cache of Photon reverse geocoding responses.
+
+    Coordinates are bucketed by rounding, so the slightly different start and
+    end points of a daily commute share one entry. Shared by all config
+    entries and used from executor threads as well as the event loop.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        max_size: int = GEOCODE_CACHE_SIZE,
+        ttl: timedelta | None = GEOCODE_TTL,
+    ) -> None:
+        """Initialize the cache."""
+        self._store: Store[GeocodeData] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.geocode_cache", private=True
+        )
+        self._max_size = max_size
+        self._ttl = ttl.total_seconds() if ttl is not None else None
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, tuple[dict[str, Any], float]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(lat: float, lon: float) -> str:
+        return f"{lat:.{GEOCODE_PRECISION}f},{lon:.{GEOCODE_PRECISION}f}"
+
+    async def async_load(self) -> None:
+        """Load the cache from disk."""
+        if data := await self._store.async_load():
+            with self._lock:
+                for key, response, stored_at in data["entries"]:
+                    self._entries[key] = (response, stored_at)
+
+    def get(self, lat: float, lon: float) -> dict[str, Any] | None:
+        """Return a cached response for a point."""
+        key = self._key(lat, lon)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and (
+                self._ttl is None or time.time() - entry[1] < self._ttl
+            ):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def set(self, lat: float, lon: float, response: dict[str, Any]) -> None:
+        """Cache a response for a point."""
+        with self._lock:
+            self._entries[self._key(lat, lon)] = (_trim(response), time.time())
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+
+    def async_schedule_save(self) -> None:
+        """Save the cache after a delay."""
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    def _data_to_save(self) -> GeocodeData:
+        with self._lock:
+            return GeocodeData(
+                entries=[
+                    (key, response, stored_at)
+                    for key, (response, stored_at) in self._entries.items()
+                ]
+            )
+
+
+class CachedPhotonClient:
+    """Drop-in for the library's PhotonClient that consults the cache first."""
+
+    def __init__(
+        self, photon: Any, cache: GeocodeCache, metrics: BonusdriveMetrics | None = None
+    ) -> None:
+        """Wrap a PhotonClient."""
+        self._photon = photon
+        self._cache = cache
+        self._metrics = metrics
+
+    def reverse_geocode(self, latitude: float, longitude: float) -> dict:
+        """Perform reverse geocoding, using the cache when possible."""
+        if (response := self._cache.get(latitude, longitude)) is not None:
+            return response
+        with self._metrics.measure("photon") if self._metrics else nullcontext():
+            response = self._photon.reverse_geocode(latitude, longitude)
+        self._cache.set(latitude, longitude, response)
+        return response
+
+
+@singleton(DATA_GEOCODE_CACHE, async_=True)
+async def async_get_geocode_cache(hass: HomeAssistant) -> GeocodeCache:
+    """Return the geocoding cache shared by all config entries."""
+    cache = GeocodeCache(hass)
+    await cache.async_load()
+    return cache
@@ -0,0 +1,114 @@
+"""Trip geometry processing for bonusdrive."""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+import polyline
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from allianz_bonusdrive_client import Trip
+
+# Precision of the polylines used by the API
+POLYLINE_PRECISION = 6
+EARTH_RADIUS = 6_371_000
+
+type Point = tuple[float, float]
+
+
+def simplify(points: Sequence[Point], tolerance: float) -> list[Point]:
+    """
+    Simplify a line of (lat, lon) points with the Douglas-Peucker algorithm.
+
+    Points closer than ``tolerance`` meters to the simplified line are
+    dropped; the first and last point are always kept.
+    """
+    if len(points) < 3 or tolerance <= 0:  # noqa: PLR2004 Nothing to drop
+        return list(points)
+
+    # Equirectangular projection around the trace, accurate enough for the
+    # extent of a car trip
+    scale = math.cos(math.radians(sum(lat for lat, _ in points) / len(points)))
+    xy = [
+        (math.radians(lon) * scale * EARTH_RADIUS, math.radians(lat) * EARTH_RADIUS)
+        for lat, lon in points
+    ]
+
+    keep = [False] * len(points)
+    keep[0] = keep[-1] = True
+    stack = [(0, len(points) - 1)]
+    while stack:
+        first, last = stack.pop()
+        (x1, y1), (x2, y2) = xy[first], xy[last]
+        dx, dy = x2 - x1, y2 - y1
+        length = math.hypot(dx, dy)
+        farthest, max_distance = first, 0.0
+        for index in range(first + 1, last):
+            x, y = xy[index]
+            distance = (
+                abs(dy * x - dx * y + x2 * y1 - y2 * x1) / length
+                if length
+                else math.hypot(x - x1, y - y1)
+            )
+            if distance > max_distance:
+                farthest, max_distance = index, distance
+        if max_distance > tolerance:
+            keep[farthest] = True
+            stack.append((first, farthest))
+            stack.append((farthest, last))
+    return [point for point, kept in zip(points, keep, strict=True) if kept]
+
+
+@dataclass(frozen=True, slots=True)
+class TripGeometry:
+    """Simplified route of a trip, with precomputed endpoints and extent."""
+
+    points: tuple[Point, ...]
+    start: Point
+    end: Point
+    # South-west and north-east corner
+    bbox: tuple[Point, Point]
+    # Number of points in the raw GPS trace
+    raw_points: int
+
+    @classmethod
+    def from_points(cls, points: Sequence[Point], tolerance: float) -> TripGeometry:
+        """Process a raw GPS trace."""
+        lats = [lat for lat, _ in points]
+        lons = [lon for _, lon in points]
+        return cls(
+            points=tuple(simplify(points, tolerance)),
+            start=points[0],
+            end=points[-1],
+            bbox=((min(lats), min(lons)), (max(lats), max(lons))),
+            raw_points=len(points),
+        )
+
+    @property
+    def polyline(self) -> str:
+        """Return the simplified route as encoded polyline."""
+        return polyline.encode(self.points, POLYLINE_PRECISION)
+
+
+def process_trip_geometry(trip: Trip, tolerance: float) -> TripGeometry | None:
+    """
+    Replace the raw GPS trace of a trip by a simplified one.
+
+    The decoded geometry and the encoded polyline of the trip are swapped for
+    the simplified route and the snapped geometry is dropped, so a cached trip
+    doesn't keep the full trace in memory.
+    """
+    points = trip.decoded_geometry or (
+        polyline.decode(trip.geometry, POLYLINE_PRECISION) if trip.geometry else None
+    )
+    if not points:
+        return None
+    geometry = TripGeometry.from_points(points, tolerance)
+    trip.decoded_geometry = list(geometry.points)
+    trip.geometry = geometry.polyline
+    trip.snappedGeometry = []
+    return geometry
@@ -0,0 +1,216 @@
+"""Trip history sync for bonusdrive."""
+
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.helpers.storage import STORAGE_DIR
+
+from .api import BonusdriveApiClientError
+from .archive import TripArchive
+from .const import DOMAIN, LOGGER
+
+if TYPE_CHECKING:
+    from allianz_bonusdrive_client import Trip
+    from homeassistant.core import HomeAssistant
+
+    from .api import BonusdriveApiClient
+    from .archive import TripSummary
+
+# Trips per request when looking for new trips (steady state)
+SYNC_PAGE_SIZE = 5
+# Trips per request and requests per run when backfilling older trips
+BACKFILL_PAGE_SIZE = 50
+BACKFILL_PAGES_PER_RUN = 4
+
+
+class BonusdriveTripHistory:
+    """
+    Local copy of all trips of an account.
+
+    Past trips are backfilled once, a few pages at a time. After that, each
+    sync only pages through trips newer than the newest known one, which is a
+    single small request when nothing happened. Trips are kept in a
+    TripArchive on disk rather than in memory.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize the history."""
+        self._hass = hass
+        self._archive = TripArchive(
+            Path(hass.config.path(STORAGE_DIR, f"{DOMAIN}.{entry_id}.trips"))
+        )
+        self._lock = asyncio.Lock()
+
+    @property
+    def backfill_complete(self) -> bool:
+        """Return whether all past trips have been synced."""
+        return self._archive.meta.get("backfill_complete", False)
+
+    @property
+    def newest_trip_id(self) -> str | None:
+        """Return the ID of the newest known trip."""
+        return self._archive.newest_trip_id
+
+    @property
+    def oldest_trip_start(self) -> int | None:
+        """Return the start (ms, UTC) of the oldest known trip."""
+        return self._archive.oldest_start
+
+    @property
+    def statistics_state(self) -> dict[str, Any]:
+        """Return how far trips have been imported into statistics."""
+        return self._archive.meta.get("statistics", {})
+
+    def __len__(self) -> int:
+        """Return the number of known trips."""
+        return len(self._archive)
+
+    async def async_load(self) -> None:
+        """Open the archive."""
+        await self._hass.async_add_executor_job(self._archive.open)
+
+    async def async_close(self) -> None:
+        """Close the archive."""
+        await self._hass.async_add_executor_job(self._archive.close)
+
+    async def async_remove(self) -> None:
+        """Delete the archive."""
+        await self._hass.async_add_executor_job(self._archive.remove)
+
+    async def async_summary(self, trip_id: str) -> TripSummary | None:
+        """Return the scalar data of an archived trip."""
+        return await self._hass.async_add_executor_job(self._archive.summary, trip_id)
+
+    async def async_trips_between(
+        self, start: int | None = None, end: int | None = None
+    ) -> list[TripSummary]:
+        """Return the trips that started in [start, end) (ms, UTC), newest first."""
+        return await self._hass.async_add_executor_job(
+            self._archive.trips_between, start, end
+        )
+
+    async def async_average(
+        self, column: str, start: int | None = None, end: int | None = None
+    ) -> float | None:
+        """Return the distance-weighted average of a score over a period."""
+        return await self._hass.async_add_executor_job(
+            self._archive.average, column, start, end
+        )
+
+    async def async_total(
+        self,
+        column: str,
+        start: int | None = None,
+        end: int | None = None,
+        first_row: int = 0,
+    ) -> float:
+        """Return the sum of a column over the trips that started in a period."""
+        return await self._hass.async_add_executor_job(
+            self._archive.total, column, start, end, first_row
+        )
+
+    async def async_start_range(self, first_row: int = 0) -> tuple[int, int] | None:
+        """Return the earliest and latest start of the trips archived from a row on."""
+        return await self._hass.async_add_executor_job(
+            self._archive.start_range, first_row
+        )
+
+    async def async_geometry(self, trip_id: str) -> list[tuple[float, float]] | None:
+        """Return the geometry of an archived trip."""
+        return await self._hass.async_add_executor_job(self._archive.geometry, trip_id)
+
+    async def async_sync(self, client: BonusdriveApiClient) -> list[Trip]:
+        """Fetch trips newer than the newest known one, newest first."""
+        async with self._lock:
+            known = len(self._archive) > 0
+            new_trips: list[Trip] = []
+            offset = 0
+            while True:
+                page = await client.async_get_trips(
+                    amount=SYNC_PAGE_SIZE, offset=offset
+                )
+                fresh = [trip for trip in page if trip.tripId not in self._archive]
+                new_trips.extend(fresh)
+                # Stop at the first known trip. Without any history, older
+                # trips are left to the backfill.
+                if len(fresh) < len(page) or len(page) < SYNC_PAGE_SIZE or not known:
+                    break
+                offset += len(page)
+
+            if new_trips:
+                await self._hass.async_add_executor_job(self._archive.append, new_trips)
+                # New trips shift the older ones further back
+                await self._async_update_meta(
+                    backfill_offset=self._archive.meta.get("backfill_offset", 0)
+                    + len(new_trips)
+                )
+            return new_trips
+
+    async def async_backfill(self, client: BonusdriveApiClient) -> list[Trip]:
+        """Fetch a bounded number of pages of older trips."""
+        added: list[Trip] = []
+        async with self._lock:
+            offset = self._archive.meta.get("backfill_offset", 0)
+            complete = self.backfill_complete
+            for _ in range(BACKFILL_PAGES_PER_RUN):
+                if complete:
+                    break
+                try:
+                    page = await client.async_get_trips(
+                        amount=BACKFILL_PAGE_SIZE, offset=offset
+                    )
+                except BonusdriveApiClientError as exception:
+                    LOGGER.debug("Trip history backfill interrupted: %s", exception)
+                    break
+                added.extend(trip for trip in page if trip.tripId not in self._archive)
+                offset += len(page)
+                complete = len(page) < BACKFILL_PAGE_SIZE
+
+            await self._hass.async_add_executor_job(self._archive.append, added)
+            await self._async_update_meta(
+                backfill_offset=offset, backfill_complete=complete
+            )
+            LOGGER.debug(
+                "Trip history backfill added %s trips (%s total, complete: %s)",
+                len(added),
+                len(self._archive),
+                complete,
+            )
+        return added
+
+    async def async_backfill_until(
+        self, client: BonusdriveApiClient, start: int | None
+    ) -> bool:
+        """
+        Backfill until the history reaches back to a start (ms, UTC).
+
+        None means all trips. Return whether the history covers the start,
+        False if the API failed before.
+        """
+        while not self._covers(start):
+            offset = self._archive.meta.get("backfill_offset", 0)
+            await self.async_backfill(client)
+            if self._archive.meta.get("backfill_offset", 0) == offset:
+                # No trips came back: either the last page was empty or the
+                # backfill was interrupted
+                return self._covers(start)
+        return True
+
+    def _covers(self, start: int | None) -> bool:
+        """Return whether the history reaches back to a start (ms, UTC)."""
+        if self.backfill_complete:
+            return True
+        oldest = self.oldest_trip_start
+        return start is not None and oldest is not None and oldest <= start
+
+    async def async_set_statistics_state(self, state: dict[str, Any]) -> None:
+        """Store how far trips have been imported into statistics."""
+        await self._async_update_meta(statistics=state)
+
+    async def _async_update_meta(self, **changes: Any) -> None:
+        """Update and persist the sync state."""
+        self._archive.meta.update(changes)
+        await self._hass.async_add_executor_job(self._archive.save_meta)
@@ -0,0 +1,115 @@
+"""Latency and error metrics for bonusdrive."""
+
+from __future__ import annotations
+
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+# Upper bounds of the latency buckets (milliseconds), plus one open bucket
+BUCKETS_MS = (100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000)
+
+
+def http_status(error: BaseException) -> int | None:
+    """Return the HTTP status of a failed request, None for other errors."""
+    # aiohttp errors carry the status, requests errors their response
+    status = getattr(error, "status", None) or getattr(
+        getattr(error, "response", None), "status_code", None
+    )
+    return status if isinstance(status, int) else None
+
+
+def _error_summary(error: BaseException) -> str:
+    """
+    Return the type and HTTP status of an error, without its message.
+
+    Messages contain request URLs with user and vehicle IDs, which must not
+    end up in diagnostics.
+    """
+    name = type(error).__name__
+    return f"{name} ({status})" if (status := http_status(error)) else name
+
+
+class LatencyHistogram:
+    """Counts of durations per bucket, with the errors among them."""
+
+    def __init__(self) -> None:
+        """Initialize the histogram."""
+        self.buckets = [0] * (len(BUCKETS_MS) + 1)
+        self.count = 0
+        self.errors = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.last_ms: float | None = None
+        self.last_error: str | None = None
+
+    def record(self, duration_ms: float, error: BaseException | None) -> None:
+        """Record the duration and outcome of a call."""
+        self.buckets[bisect.bisect_left(BUCKETS_MS, duration_ms)] += 1
+        self.count += 1
+        self.total_ms += duration_ms
+        self.max_ms = max(self.max_ms, duration_ms)
+        self.last_ms = duration_ms
+        if error is not None:
+            self.errors += 1
+            self.last_error = _error_summary(error)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the histogram for diagnostics."""
+        labels = [f"<={bound}ms" for bound in BUCKETS_MS] + [f">{BUCKETS_MS[-1]}ms"]
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "mean_ms": round(self.total_ms / self.count, 1) if self.count else None,
+            "max_ms": round(self.max_ms, 1),
+            "last_ms": round(self.last_ms, 1) if self.last_ms is not None else None,
+            "last_error": self.last_error,
+            "buckets": dict(zip(labels, self.buckets, strict=True)),
+        }
+
+
+class BonusdriveMetrics:
+    """
+    Latency histograms by name, e.g. per API endpoint or refresh stage.
+
+    Recording is thread-safe, since library calls and Photon lookups run in
+    executor threads.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the metrics."""
+        self._lock = threading.Lock()
+        self.histograms: dict[str, LatencyHistogram] = {}
+
+    def record(
+        self, name: str, duration_ms: float, error: BaseException | None = None
+    ) -> None:
+        """Record a call."""
+        with self._lock:
+            if (histogram := self.histograms.get(name)) is None:
+                histogram = self.histograms[name] = LatencyHistogram()
+            histogram.record(duration_ms, error)
+
+    @contextmanager
+    def measure(self, name: str) -> Iterator[None]:
+        """Record the duration of a block, as error if it raises."""
+        start = time.perf_counter()
+        try:
+            yield
+        except Exception as exception:
+            self.record(name, (time.perf_counter() - start) * 1000, exception)
+            raise
+        self.record(name, (time.perf_counter() - start) * 1000)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return all histograms for diagnostics."""
+        with self._lock:
+            return {
+                name: histogram.as_dict()
+                for name, histogram in sorted(self.histograms.items())
+            }
@@ -0,0 +1,78 @@
+"""HTTP connections shared by all config entries."""
+
+from __future__ import annotations
+
+import asyncio
+import zlib
+from datetime import timedelta
+from typing import TYPE_CHECKING
+
+from homeassistant.core import callback
+from homeassistant.helpers.singleton import singleton
+from homeassistant.util.hass_dict import HassKey
+from requests.adapters import HTTPAdapter
+
+from .const import DOMAIN, MAX_CONCURRENT_CALLS, POLL_STAGGER
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+DATA_CLIENT_POOL: HassKey[BonusdriveClientPool] = HassKey(f"{DOMAIN}_client_pool")
+
+
+class BonusdriveClientPool:
+    """
+    Connections and request slots shared by all accounts.
+
+    Every account needs its own session for its cookies, but the connections
+    behind the sessions are pooled per backend, so several accounts on the
+    same server reuse the same keep-alive connections. A single semaphore caps
+    the number of requests in flight across all accounts.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the pool."""
+        self.semaphore = asyncio.Semaphore(MAX_CONCURRENT_CALLS)
+        # Base URL -> (adapter, clients using it)
+        self._adapters: dict[str, tuple[HTTPAdapter, set[object]]] = {}
+
+    @callback
+    def async_acquire_adapter(self, base_url: str, owner: object) -> HTTPAdapter:
+        """Return the connection pool of a backend."""
+        if base_url not in self._adapters:
+            self._adapters[base_url] = (
+                HTTPAdapter(pool_connections=1, pool_maxsize=MAX_CONCURRENT_CALLS),
+                set(),
+            )
+        adapter, owners = self._adapters[base_url]
+        owners.add(owner)
+        return adapter
+
+    @callback
+    def async_release_adapter(self, base_url: str, owner: object) -> None:
+        """Close the connections of a backend once nobody uses them."""
+        if base_url not in self._adapters:
+            return
+        adapter, owners = self._adapters[base_url]
+        owners.discard(owner)
+        if not owners:
+            del self._adapters[base_url]
+            adapter.close()
+
+
+@callback
+@singleton(DATA_CLIENT_POOL)
+def async_get_client_pool(_hass: HomeAssistant) -> BonusdriveClientPool:
+    """Return the pool shared by all config entries."""
+    return BonusdriveClientPool()
+
+
+def poll_offset(entry_id: str) -> timedelta:
+    """
+    Return a stable per-entry offset added to the polling interval.
+
+    Entries set up together would otherwise poll in lockstep forever. With
+    slightly different intervals their schedules drift apart instead.
+    """
+    seconds = POLL_STAGGER.total_seconds()
+    return timedelta(seconds=zlib.crc32(entry_id.encode()) % int(seconds))
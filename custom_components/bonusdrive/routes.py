@@ -0,0 +1,176 @@
+"""GeoJSON endpoint for trip routes."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from collections import OrderedDict
+from datetime import UTC, datetime
+from http import HTTPStatus
+from typing import TYPE_CHECKING, Any
+
+from aiohttp import hdrs, web
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.core import callback
+from homeassistant.helpers.http import KEY_HASS, HomeAssistantView
+from homeassistant.helpers.singleton import singleton
+from homeassistant.util.hass_dict import HassKey
+
+from .const import CONF_GEOMETRY_TOLERANCE, DEFAULT_GEOMETRY_TOLERANCE, DOMAIN
+from .geometry import simplify
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+    from .archive import TripSummary
+    from .data import BonusdriveConfigEntry
+    from .geometry import Point
+
+DATA_ROUTE_VIEW: HassKey[BonusdriveRouteView] = HassKey(f"{DOMAIN}_route_view")
+
+# Rendered routes kept in memory, across all config entries
+ROUTE_CACHE_SIZE = 32
+# Alias for the newest trip of an account
+LAST_TRIP = "last"
+
+
+def route_url(entry_id: str, trip_id: str) -> str:
+    """Return the URL of the GeoJSON route of a trip."""
+    return BonusdriveRouteView.url.format(entry_id=entry_id, trip_id=trip_id)
+
+
+class BonusdriveRouteView(HomeAssistantView):
+    """
+    Serve the route of a trip as GeoJSON Feature.
+
+    Trips never change, so each route is rendered once and then served from
+    memory. Responses carry an ETag, which lets map cards that poll the route
+    get a bodyless 304 while the trip is the same.
+    """
+
+    url = "/api/bonusdrive/{entry_id}/trips/{trip_id}"
+    name = "api:bonusdrive:trip_route"
+
+    def __init__(self) -> None:
+        """Initialize the view."""
+        # (entry ID, trip ID) -> (GeoJSON, ETag)
+        self._cache: OrderedDict[tuple[str, str], tuple[bytes, str]] = OrderedDict()
+
+    async def get(
+        self, request: web.Request, entry_id: str, trip_id: str
+    ) -> web.Response:
+        """Return the route of a trip, ``last`` for the newest trip."""
+        hass = request.app[KEY_HASS]
+        entry: BonusdriveConfigEntry | None = hass.config_entries.async_get_entry(
+            entry_id
+        )
+        if (
+            entry is None
+            or entry.domain != DOMAIN
+            or entry.state is not ConfigEntryState.LOADED
+        ):
+            return self.json_message("Unknown config entry", HTTPStatus.NOT_FOUND)
+        if trip_id == LAST_TRIP:
+            trip_id = entry.runtime_data.history.newest_trip_id or ""
+
+        key = (entry_id, trip_id)
+        if (cached := self._cache.get(key)) is not None:
+            self._cache.move_to_end(key)
+        else:
+            rendered = await self._async_render(hass, entry, trip_id)
+            if rendered is None:
+                return self.json_message("Unknown trip", HTTPStatus.NOT_FOUND)
+            body, complete = rendered
+            cached = (body, f'"{hashlib.blake2b(body, digest_size=8).hexdigest()}"')
+            # Without the summary the trip isn't archived yet, the route gets
+            # its properties once it is
+            if complete:
+                self._cache[key] = cached
+                if len(self._cache) > ROUTE_CACHE_SIZE:
+                    self._cache.popitem(last=False)
+
+        body, etag = cached
+        headers = {hdrs.ETAG: etag, hdrs.CACHE_CONTROL: "private, no-cache"}
+        if etag in request.headers.getall(hdrs.IF_NONE_MATCH, []):
+            return web.Response(status=HTTPStatus.NOT_MODIFIED, headers=headers)
+        return web.Response(
+            body=body, content_type="application/geo+json", headers=headers
+        )
+
+    @callback
+    def async_forget(self, entry_id: str) -> None:
+        """Drop the cached routes of a config entry."""
+        for key in [key for key in self._cache if key[0] == entry_id]:
+            del self._cache[key]
+
+    @staticmethod
+    async def _async_render(
+        hass: HomeAssistant, entry: BonusdriveConfigEntry, trip_id: str
+    ) -> tuple[bytes, bool] | None:
+        """
+        Render the GeoJSON of a trip from the trip details or the history.
+
+        Return it with whether the trip summary was available.
+        """
+        summary = await entry.runtime_data.history.async_summary(trip_id)
+        points = await async_trip_points(hass, entry, trip_id)
+        if summary is None and not points:
+            return None
+        body = await hass.async_add_executor_job(
+            _feature, trip_id, points or [], summary
+        )
+        return body, summary is not None
+
+
+async def async_trip_points(
+    hass: HomeAssistant, entry: BonusdriveConfigEntry, trip_id: str
+) -> list[Point] | None:
+    """Return the simplified route of a trip from the trip details or the history."""
+    if (geometry := entry.runtime_data.client.trip_geometry(trip_id)) is not None:
+        return list(geometry.points)
+    if (points := await entry.runtime_data.history.async_geometry(trip_id)) is None:
+        return None
+    return await hass.async_add_executor_job(
+        simplify,
+        points,
+        entry.data.get(CONF_GEOMETRY_TOLERANCE, DEFAULT_GEOMETRY_TOLERANCE),
+    )
+
+
+def _feature(trip_id: str, points: list[Point], summary: TripSummary | None) -> bytes:
+    """
+    Serialize a trip as GeoJSON Feature with a LineString.
+
+    A LineString needs two positions, so a trip with a single point is a Point
+    and one without any has no geometry.
+    """
+    properties: dict[str, Any] = {"trip_id": trip_id}
+    if summary is not None:
+        properties |= {
+            "start_time": datetime.fromtimestamp(
+                summary["start"] / 1000, tz=UTC
+            ).isoformat(),
+            "end_time": datetime.fromtimestamp(
+                summary["end"] / 1000, tz=UTC
+            ).isoformat(),
+            "distance_km": summary["kilometers"],
+            "score": summary["score"],
+        }
+    # GeoJSON positions are longitude first
+    coordinates = [[lon, lat] for lat, lon in points]
+    geometry: dict[str, Any] | None = None
+    if len(coordinates) > 1:
+        geometry = {"type": "LineString", "coordinates": coordinates}
+    elif coordinates:
+        geometry = {"type": "Point", "coordinates": coordinates[0]}
+    feature = {"type": "Feature", "geometry": geometry, "properties": properties}
+    return json.dumps(feature, separators=(",", ":")).encode()
+
+
+@callback
+@singleton(DATA_ROUTE_VIEW)
+def async_register_route_view(hass: HomeAssistant) -> BonusdriveRouteView:
+    """Register the route endpoint, once for all config entries."""
+    view = BonusdriveRouteView()
+    hass.http.register_view(view)
+    return view
@@ -0,0 +1,111 @@
+"""
+Runtime setup of bonusdrive config entries.
+
+Everything a loaded config entry needs (client, coordinator, stores) is set up
+from here. The integration imports this module on first setup, off the event
+loop, so loading the integration alone, e.g. for the config flow, doesn't load
+the client library or the coordinator.
+"""
+
+from __future__ import annotations
+
+from functools import partial
+from typing import TYPE_CHECKING
+
+from homeassistant.const import CONF_EMAIL, CONF_PASSWORD
+from homeassistant.loader import async_get_loaded_integration
+
+from .api import BonusdriveApiClient, async_import_backend
+from .badges import BonusdriveBadgeHistory
+from .const import (
+    CONF_BASE_URL,
+    CONF_GEOMETRY_TOLERANCE,
+    CONF_NATIVE_TRANSPORT,
+    CONF_PHOTON_URL,
+    DEFAULT_BASE_URL,
+    DEFAULT_GEOMETRY_TOLERANCE,
+    DOMAIN,
+    LOGGER,
+    UPDATE_INTERVAL_DEFAULT,
+)
+from .coordinator import BonusdriveDataUpdateCoordinator
+from .data import BonusdriveData
+from .geocode import async_get_geocode_cache
+from .history import BonusdriveTripHistory
+from .pool import async_get_client_pool
+from .routes import async_register_route_view
+from .scores import BonusdrivePeriodScores
+from .store import BonusdriveSessionStore, async_take_over_session
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+    from .data import BonusdriveConfigEntry
+
+
+async def async_setup_runtime(
+    hass: HomeAssistant,
+    entry: BonusdriveConfigEntry,
+) -> None:
+    """Create the runtime data of an entry and do the first refresh."""
+    coordinator = BonusdriveDataUpdateCoordinator(
+        hass=hass,
+        logger=LOGGER,
+        name=DOMAIN,
+        update_interval=UPDATE_INTERVAL_DEFAULT,
+    )
+
+    session_store = BonusdriveSessionStore(hass, entry.entry_id)
+    if tgt := async_take_over_session(hass, entry.unique_id):
+        # The config flow just logged in, continue with its session
+        await session_store.async_save(tgt)
+
+    native_transport = entry.data.get(CONF_NATIVE_TRANSPORT, False)
+    await async_import_backend(hass, native_transport=native_transport)
+    client = BonusdriveApiClient(
+        hass=hass,
+        base_url=entry.data.get(CONF_BASE_URL, DEFAULT_BASE_URL),
+        email=entry.data[CONF_EMAIL],
+        password=entry.data[CONF_PASSWORD],
+        photon_url=entry.data.get(CONF_PHOTON_URL),
+        session_store=session_store,
+        geocode_cache=await async_get_geocode_cache(hass),
+        native_transport=native_transport,
+        pool=async_get_client_pool(hass),
+        geometry_tolerance=entry.data.get(
+            CONF_GEOMETRY_TOLERANCE, DEFAULT_GEOMETRY_TOLERANCE
+        ),
+    )
+    entry.async_on_unload(client.async_close)
+
+    history = BonusdriveTripHistory(hass, entry.entry_id)
+    await history.async_load()
+    # Also closes the memory maps when the first refresh fails
+    entry.async_on_unload(history.async_close)
+    scores = BonusdrivePeriodScores(hass, entry.entry_id)
+    await scores.async_load()
+    badges = BonusdriveBadgeHistory(hass, entry.entry_id)
+    await badges.async_load()
+
+    entry.runtime_data = BonusdriveData(
+        client=client,
+        integration=async_get_loaded_integration(hass, entry.domain),
+        coordinator=coordinator,
+        history=history,
+        scores=scores,
+        badges=badges,
+    )
+
+    route_view = async_register_route_view(hass)
+    entry.async_on_unload(partial(route_view.async_forget, entry.entry_id))
+
+    # https://developers.home-assistant.io/docs/integration_fetching_data#coordinated-single-api-poll-for-data-for-all-entities
+    await coordinator.async_config_entry_first_refresh()
+
+
+async def async_remove_stored_data(hass: HomeAssistant, entry_id: str) -> None:
+    """Remove the session, trip history, scores and badges of an entry."""
+    await BonusdriveSessionStore(hass, entry_id).async_remove()
+    await BonusdriveTripHistory(hass, entry_id).async_remove()
+    await BonusdrivePeriodScores(hass, entry_id).async_remove()
+    await BonusdriveBadgeHistory(hass, entry_id).async_remove()
@@ -0,0 +1,286 @@
+"""Aggregated scores of calendar periods for bonusdrive."""
+
+from __future__ import annotations
+
+from datetime import UTC, date, datetime, timedelta
+from typing import TYPE_CHECKING, TypedDict
+
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN
+
+if TYPE_CHECKING:
+    from allianz_bonusdrive_client import Scores
+    from homeassistant.core import HomeAssistant
+
+    from .api import BonusdriveApiClient
+
+STORAGE_VERSION = 1
+SAVE_DELAY = 60
+
+PERIODS = ("week", "month", "year")
+# Longest date range of a single request for daily scores
+DAILY_RANGE_DAYS = 366
+# Trips are uploaded after they end, so a closed period is fetched once more
+# this long after it closed before it is final
+CLOSED_GRACE = timedelta(days=1)
+
+
+class PeriodScore(TypedDict):
+    """Aggregated scores of a period."""
+
+    start: str
+    end: str
+    score: float | None
+    days: int
+    speeding: float | None
+    harsh_braking: float | None
+    harsh_acceleration: float | None
+    harsh_cornering: float | None
+    payd: float | None
+
+
+class PeriodScoreData(TypedDict):
+    """Stored scores of closed periods, keyed by period and start date."""
+
+    closed: dict[str, PeriodScore]
+    # Keys of the closed periods fetched after the grace time
+    final: list[str]
+
+
+class DailyScore(TypedDict):
+    """Scores of a day."""
+
+    score: float | None
+    speeding: float | None
+    harsh_braking: float | None
+    harsh_acceleration: float | None
+    harsh_cornering: float | None
+    payd: float | None
+
+
+class DailyScoreData(TypedDict):
+    """Stored scores of past days with trips, keyed by date."""
+
+    days: dict[str, DailyScore]
+
+
+def period_bounds(period: str, day: date) -> tuple[date, date]:
+    """Return the first and last day of the period containing a day."""
+    if period == "week":
+        start = day - timedelta(days=day.weekday())
+        return start, start + timedelta(days=6)
+    if period == "month":
+        start = day.replace(day=1)
+        next_month = (start + timedelta(days=32)).replace(day=1)
+        return start, next_month - timedelta(days=1)
+    return day.replace(month=1, day=1), day.replace(month=12, day=31)
+
+
+def score_day(key: int | str) -> str:
+    """Return the day (YYYY-MM-DD) of a key of the scores endpoint, epoch ms."""
+    return datetime.fromtimestamp(int(key) / 1000, tz=UTC).date().isoformat()
+
+
+def aggregate(start: date, end: date, daily: dict[str, Scores]) -> PeriodScore:
+    """Average the daily scores of a period."""
+    days = list(daily.values())
+
+    def mean(field: str) -> float | None:
+        values = [getattr(scores, field) for scores in days]
+        return round(sum(values) / len(values), 1) if values else None
+
+    return PeriodScore(
+        start=start.isoformat(),
+        end=end.isoformat(),
+        score=mean("overall"),
+        days=len(days),
+        speeding=mean("speeding"),
+        harsh_braking=mean("harsh_braking"),
+        harsh_acceleration=mean("harsh_acceleration"),
+        harsh_cornering=mean("harsh_cornering"),
+        payd=mean("payd"),
+    )
+
+
+def daily_score(scores: Scores) -> DailyScore:
+    """Round the scores of a day."""
+    return DailyScore(
+        score=round(scores.overall, 1),
+        speeding=round(scores.speeding, 1),
+        harsh_braking=round(scores.harsh_braking, 1),
+        harsh_acceleration=round(scores.harsh_acceleration, 1),
+        harsh_cornering=round(scores.harsh_cornering, 1),
+        payd=round(scores.payd, 1),
+    )
+
+
+def daily_average(daily: dict[str, DailyScore]) -> DailyScore:
+    """Average the scores of several days."""
+
+    def mean(field: str) -> float | None:
+        values = [value for day in daily.values() if (value := day[field]) is not None]
+        return round(sum(values) / len(values), 1) if values else None
+
+    return DailyScore(
+        score=mean("score"),
+        speeding=mean("speeding"),
+        harsh_braking=mean("harsh_braking"),
+        harsh_acceleration=mean("harsh_acceleration"),
+        harsh_cornering=mean("harsh_cornering"),
+        payd=mean("payd"),
+    )
+
+
+class BonusdrivePeriodScores:
+    """
+    Scores of the current and the previous week, month and year.
+
+    Each period is one request to the scores endpoint. Closed periods are
+    fetched when they close and once more after a grace time, for trips that
+    were uploaded late, then stored for good. The current period is reused
+    until a new trip shows up or the period rolls over.
+
+    Scores of single days are only fetched on request, see async_daily.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize the period scores."""
+        self._store: Store[PeriodScoreData] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}.scores", private=True
+        )
+        self._closed: dict[str, PeriodScore] = {}
+        self._final: set[str] = set()
+        # Period -> (trip ID it was fetched for, scores)
+        self._current: dict[str, tuple[str | None, PeriodScore]] = {}
+        self._daily_store: Store[DailyScoreData] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}.daily_scores", private=True
+        )
+        # Loaded on the first request for daily scores
+        self._daily: dict[str, DailyScore] | None = None
+
+    async def async_load(self) -> None:
+        """Load the scores of closed periods."""
+        if data := await self._store.async_load():
+            self._closed = data["closed"]
+            self._final = set(data.get("final", []))
+
+    async def async_remove(self) -> None:
+        """Remove the stored scores."""
+        await self._store.async_remove()
+        await self._daily_store.async_remove()
+
+    async def async_update(
+        self, client: BonusdriveApiClient, today: date, trip_id: str | None
+    ) -> dict[str, PeriodScore]:
+        """
+        Return the scores of all periods, fetching only what may have changed.
+
+        The result has the current period under its name (e.g. ``week``) and
+        the previous one with a ``previous_`` prefix.
+        """
+        scores: dict[str, PeriodScore] = {}
+        # Only the previous periods are kept, older ones aren't shown anymore
+        closed: dict[str, PeriodScore] = {}
+        final: set[str] = set()
+        for period in PERIODS:
+            start, end = period_bounds(period, today)
+            cached = self._current.get(period)
+            if (
+                cached is None
+                or cached[1]["start"] != start.isoformat()
+                or cached[0] != trip_id
+            ):
+                cached = (
+                    trip_id,
+                    await self._async_fetch(client, start, end, min(end, today)),
+                )
+                self._current[period] = cached
+            scores[period] = cached[1]
+
+            previous_start, previous_end = period_bounds(
+                period, start - timedelta(days=1)
+            )
+            key = f"{period}:{previous_start.isoformat()}"
+            after_grace = today > previous_end + CLOSED_GRACE
+            closed_score = self._closed.get(key)
+            if closed_score is None or (key not in self._final and after_grace):
+                closed_score = await self._async_fetch(
+                    client, previous_start, previous_end, previous_end
+                )
+            if key in self._final or after_grace:
+                final.add(key)
+            closed[key] = closed_score
+            scores[f"previous_{period}"] = closed_score
+
+        if closed != self._closed or final != self._final:
+            self._closed = closed
+            self._final = final
+            await self._store.async_save({"closed": closed, "final": sorted(final)})
+        return scores
+
+    async def async_daily(
+        self, client: BonusdriveApiClient, start: date, end: date, today: date
+    ) -> dict[str, DailyScore]:
+        """
+        Return the scores of the days in [start, end] that have trips.
+
+        Scores of days before yesterday are final: they are stored once
+        fetched, and only the days missing from the store are requested, one
+        request per gap. Trips are uploaded after they end, so yesterday and
+        today are always requested.
+        """
+        if self._daily is None:
+            data = await self._daily_store.async_load()
+            # Days without a score were stored as None before, requested again
+            self._daily = (
+                {key: day for key, day in data["days"].items() if day is not None}
+                if data
+                else {}
+            )
+        days = self._daily
+        final = today - timedelta(days=1)
+
+        scores: dict[str, DailyScore] = {}
+        stored = False
+        gaps: list[tuple[date, date]] = []
+        day = start
+        while day <= min(end, today):
+            key = day.isoformat()
+            if day < final and key in days:
+                scores[key] = days[key]
+            elif (
+                gaps
+                and gaps[-1][1] == day - timedelta(days=1)
+                and (day - gaps[-1][0]).days < DAILY_RANGE_DAYS
+            ):
+                gaps[-1] = (gaps[-1][0], day)
+            else:
+                gaps.append((day, day))
+            day += timedelta(days=1)
+
+        for first, last in gaps:
+            fetched = await client.async_get_scores(
+                start_date=first.isoformat(), end_date=last.isoformat()
+            )
+            if not isinstance(fetched, dict):
+                continue
+            for key, value in fetched.items():
+                day_key = score_day(key)
+                scores[day_key] = daily_score(value)
+                if day_key < final.isoformat():
+                    days[day_key] = scores[day_key]
+                    stored = True
+        if stored:
+            self._daily_store.async_delay_save(lambda: {"days": days}, SAVE_DELAY)
+        return dict(sorted(scores.items()))
+
+    @staticmethod
+    async def _async_fetch(
+        client: BonusdriveApiClient, start: date, end: date, until: date
+    ) -> PeriodScore:
+        """Fetch and aggregate the scores of a period up to a day."""
+        daily = await client.async_get_scores(
+            start_date=start.isoformat(), end_date=until.isoformat()
+        )
+        return aggregate(start, end, daily if isinstance(daily, dict) else {})
@@ -6,19 +6,30 @@ from datetime import UTC, datetime
 from typing import TYPE_CHECKING, Any
 
 from homeassistant.components.sensor import (
+    SensorDeviceClass,
     SensorEntity,
     SensorStateClass,
 )
+from homeassistant.const import EntityCategory, UnitOfTime
+from homeassistant.core import callback
+from homeassistant.helpers.event import async_track_point_in_utc_time
 
+from .breaker import BreakerState
 from .const import CONF_PHOTON_URL
+from .data import badge_fingerprint
 from .entity import BonusdriveEntity
+from .routes import route_url
+from .scores import PERIODS
 
 if TYPE_CHECKING:
-    from homeassistant.core import HomeAssistant
+    from allianz_bonusdrive_client import Badge, Trip
+    from homeassistant.core import CALLBACK_TYPE, HomeAssistant
     from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
+    from .badges import BadgeStats
     from .coordinator import BonusdriveDataUpdateCoordinator
     from .data import BonusdriveConfigEntry
+    from .scores import PeriodScore
 
 
 # Medal level mapping: level -> translation key
@@ -31,9 +42,6 @@ MEDAL_LEVELS: dict[int, str] = {
 }
 DEFAULT_MEDAL = "none"
 
-# Minimum number of coordinates needed for lat/lon pair
-MIN_COORD_LENGTH = 2
-
 
 def get_medal_for_level(level: int) -> str:
     """Get the medal translation key for a badge level."""
@@ -52,6 +60,14 @@ async def async_setup_entry(
         LastTripSensor(coordinator),
         DailyBadgeSensor(coordinator),
         MonthlyBadgeSensor(coordinator),
+        *(PeriodScoreSensor(coordinator, period) for period in PERIODS),
+        MedalStreakSensor(coordinator),
+        MonthlyMedalsSensor(coordinator),
+        MedalTrendSensor(coordinator),
+        PollingIntervalSensor(coordinator),
+        ApiStatusSensor(coordinator),
+        RefreshDurationSensor(coordinator),
+        ApiLatencySensor(coordinator),
     ]
 
     async_add_entities(entities)
@@ -62,7 +78,11 @@ class LastTripSensor(BonusdriveEntity, SensorEntity):
 
     _attr_translation_key = "last_trip"
     _attr_icon = "mdi:car-connected"
-    _attr_state_class = SensorStateClass.MEASUREMENT
+    _data_slice = "last_trip"
+
+    # Attributes are memoized on the identity of the trip/badge they describe
+    _attrs_key: Any = None
+    _attrs: dict[str, Any] | None = None
 
     def __init__(self, coordinator: BonusdriveDataUpdateCoordinator) -> None:
         """Initialize the sensor."""
@@ -78,11 +98,16 @@ class LastTripSensor(BonusdriveEntity, SensorEntity):
 
     @property
     def extra_state_attributes(self) -> dict[str, Any] | None:
-        """Return detailed trip attributes."""
-        if not self.coordinator.data or not self.coordinator.data.last_trip:
-            return None
-
-        trip = self.coordinator.data.last_trip
+        """Return detailed trip attributes, built once per trip."""
+        trip = self.coordinator.data.last_trip if self.coordinator.data else None
+        key = trip.tripId if trip else None
+        if key != self._attrs_key:
+            self._attrs_key = key
+            self._attrs = self._trip_attributes(trip) if trip else None
+        return self._attrs
+
+    def _trip_attributes(self, trip: Trip) -> dict[str, Any]:
+        """Build the attributes of a trip."""
         scores = trip.tripScores.scores if trip.tripScores else None
 
         # Format duration as h:mm:ss
@@ -108,21 +133,18 @@ class LastTripSensor(BonusdriveEntity, SensorEntity):
             ).isoformat(),
         }
 
-        # Add start/end coordinates from decoded_geometry if available
-        decoded_geometry = getattr(trip, "decoded_geometry", None)
-        if decoded_geometry and len(decoded_geometry) >= MIN_COORD_LENGTH:
-            start_point = decoded_geometry[0]
-            end_point = decoded_geometry[-1]
-            if start_point and len(start_point) >= MIN_COORD_LENGTH:
-                lat_dir = "N" if start_point[0] >= 0 else "S"
-                lon_dir = "E" if start_point[1] >= 0 else "W"
-                attrs["start_latitude"] = f"{lat_dir} {abs(start_point[0]):.6f}"
-                attrs["start_longitude"] = f"{lon_dir} {abs(start_point[1]):.6f}"
-            if end_point and len(end_point) >= MIN_COORD_LENGTH:
-                lat_dir = "N" if end_point[0] >= 0 else "S"
-                lon_dir = "E" if end_point[1] >= 0 else "W"
-                attrs["end_latitude"] = f"{lat_dir} {abs(end_point[0]):.6f}"
-                attrs["end_longitude"] = f"{lon_dir} {abs(end_point[1]):.6f}"
+        # Add start/end coordinates from the processed route if available
+        geometry = self.coordinator.data.last_trip_geometry
+        if geometry and geometry.start:
+            lat_dir = "N" if geometry.start[0] >= 0 else "S"
+            lon_dir = "E" if geometry.start[1] >= 0 else "W"
+            attrs["start_latitude"] = f"{lat_dir} {abs(geometry.start[0]):.6f}"
+            attrs["start_longitude"] = f"{lon_dir} {abs(geometry.start[1]):.6f}"
+        if geometry and geometry.end:
+            lat_dir = "N" if geometry.end[0] >= 0 else "S"
+            lon_dir = "E" if geometry.end[1] >= 0 else "W"
+            attrs["end_latitude"] = f"{lat_dir} {abs(geometry.end[0]):.6f}"
+            attrs["end_longitude"] = f"{lon_dir} {abs(geometry.end[1]):.6f}"
 
         # Add location strings if available (from Photon geocoding)
         if self.coordinator.config_entry.data.get(CONF_PHOTON_URL):
@@ -131,6 +153,11 @@ class LastTripSensor(BonusdriveEntity, SensorEntity):
             if hasattr(trip, "end_point_string") and trip.end_point_string:
                 attrs["end_location"] = trip.end_point_string
 
+        # GeoJSON of the route, see routes.py
+        attrs["route_url"] = route_url(
+            self.coordinator.config_entry.entry_id, trip.tripId
+        )
+
         # Add detailed scores if available
         if scores:
             attrs["speeding_score"] = round(scores.speeding, 1)
@@ -147,6 +174,11 @@ class DailyBadgeSensor(BonusdriveEntity, SensorEntity):
 
     _attr_translation_key = "daily_badge"
     _attr_icon = "mdi:medal"
+    _data_slice = "daily_badge"
+
+    # Attributes are memoized on the identity of the trip/badge they describe
+    _attrs_key: Any = None
+    _attrs: dict[str, Any] | None = None
 
     def __init__(self, coordinator: BonusdriveDataUpdateCoordinator) -> None:
         """Initialize the sensor."""
@@ -162,14 +194,23 @@ class DailyBadgeSensor(BonusdriveEntity, SensorEntity):
 
     @property
     def extra_state_attributes(self) -> dict[str, Any] | None:
-        """Return badge and score attributes."""
+        """Return badge and score attributes, built once per badge state."""
         if not self.coordinator.data:
             return None
 
+        badge = self.coordinator.data.daily_badge
+        key = badge_fingerprint(badge)
+        if key != self._attrs_key:
+            self._attrs_key = key
+            self._attrs = self._badge_attributes(badge)
+        return self._attrs
+
+    @staticmethod
+    def _badge_attributes(badge: Badge | None) -> dict[str, Any] | None:
+        """Build the attributes of a daily badge."""
         attrs: dict[str, Any] = {}
 
         # Add badge info if available
-        badge = self.coordinator.data.daily_badge
         if badge:
             attrs["level"] = badge.level
             attrs["medal"] = get_medal_for_level(badge.level)
@@ -187,6 +228,11 @@ class MonthlyBadgeSensor(BonusdriveEntity, SensorEntity):
 
     _attr_translation_key = "monthly_badge"
     _attr_icon = "mdi:trophy"
+    _data_slice = "monthly_badge"
+
+    # Attributes are memoized on the identity of the trip/badge they describe
+    _attrs_key: Any = None
+    _attrs: dict[str, Any] | None = None
 
     def __init__(self, coordinator: BonusdriveDataUpdateCoordinator) -> None:
         """Initialize the sensor."""
@@ -213,12 +259,17 @@ class MonthlyBadgeSensor(BonusdriveEntity, SensorEntity):
 
     @property
     def extra_state_attributes(self) -> dict[str, Any] | None:
-        """Return badge attributes."""
-        if not self.coordinator.data or not self.coordinator.data.monthly_badge:
-            return None
-
-        badge = self.coordinator.data.monthly_badge
-
+        """Return badge attributes, built once per badge state."""
+        badge = self.coordinator.data.monthly_badge if self.coordinator.data else None
+        key = badge_fingerprint(badge)
+        if key != self._attrs_key:
+            self._attrs_key = key
+            self._attrs = self._badge_attributes(badge) if badge else None
+        return self._attrs
+
+    @staticmethod
+    def _badge_attributes(badge: Badge) -> dict[str, Any]:
+        """Build the attributes of a monthly badge."""
         attrs: dict[str, Any] = {
             "level": badge.level,
             "points_awarded": badge.pointsAwarded,
@@ -229,3 +280,295 @@ class MonthlyBadgeSensor(BonusdriveEntity, SensorEntity):
         }
 
         return attrs
+
+
+class PeriodScoreSensor(BonusdriveEntity, SensorEntity):
+    """Sensor for the average score of the current week, month or year."""
+
+    _attr_icon = "mdi:chart-line"
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    def __init__(
+        self, coordinator: BonusdriveDataUpdateCoordinator, period: str
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator)
+        self._period = period
+        self._data_slice = f"{period}_score"
+        self._attr_translation_key = f"{period}_score"
+        self._attr_unique_id = f"{coordinator.config_entry.entry_id}_{period}_score"
+
+    def _scores(self, key: str) -> PeriodScore | None:
+        if not self.coordinator.data:
+            return None
+        return self.coordinator.data.period_scores.get(key)
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the average score of the period."""
+        scores = self._scores(self._period)
+        return scores["score"] if scores else None
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return the sub-scores of the period and the previous score."""
+        scores = self._scores(self._period)
+        if not scores:
+            return None
+        previous = self._scores(f"previous_{self._period}")
+        return {
+            "start": scores["start"],
+            "end": scores["end"],
+            "days": scores["days"],
+            "speeding_score": scores["speeding"],
+            "harsh_braking_score": scores["harsh_braking"],
+            "harsh_acceleration_score": scores["harsh_acceleration"],
+            "harsh_cornering_score": scores["harsh_cornering"],
+            "payd_score": scores["payd"],
+            "previous_score": previous["score"] if previous else None,
+        }
+
+
+class BadgeStatsSensor(BonusdriveEntity, SensorEntity):
+    """Base for sensors computed from the badge history."""
+
+    _data_slice = "badge_stats"
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    def __init__(self, coordinator: BonusdriveDataUpdateCoordinator) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator)
+        self._attr_unique_id = (
+            f"{coordinator.config_entry.entry_id}_{self._attr_translation_key}"
+        )
+
+    @property
+    def _stats(self) -> BadgeStats | None:
+        return self.coordinator.data.badge_stats if self.coordinator.data else None
+
+
+class MedalStreakSensor(BadgeStatsSensor):
+    """Sensor for the number of daily medals in a row."""
+
+    _attr_translation_key = "medal_streak"
+    _attr_icon = "mdi:fire"
+
+    @property
+    def native_value(self) -> int | None:
+        """Return the current streak."""
+        return self._stats["streak"] if self._stats else None
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return when the streak started and the longest one."""
+        if not self._stats:
+            return None
+        return {
+            "streak_start": self._stats["streak_start"],
+            "best_streak": self._stats["best_streak"],
+        }
+
+
+class MonthlyMedalsSensor(BadgeStatsSensor):
+    """Sensor for the number of daily medals this month."""
+
+    _attr_translation_key = "monthly_medals"
+    _attr_icon = "mdi:medal-outline"
+
+    @property
+    def native_value(self) -> int | None:
+        """Return the medals of this month."""
+        return self._stats["month_medals"] if self._stats else None
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return the number of daily badges per medal."""
+        if not self._stats:
+            return None
+        levels = self._stats["month_levels"]
+        return {medal: levels.get(level, 0) for level, medal in MEDAL_LEVELS.items()}
+
+
+class MedalTrendSensor(BadgeStatsSensor):
+    """Sensor for the medals of this month compared with last month."""
+
+    _attr_translation_key = "medal_trend"
+    _attr_icon = "mdi:trending-up"
+
+    @property
+    def native_value(self) -> int | None:
+        """Return the difference to last month up to the same day."""
+        if not self._stats:
+            return None
+        return (
+            self._stats["month_medals"] - self._stats["previous_month_medals_to_date"]
+        )
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return the medals of last month."""
+        if not self._stats:
+            return None
+        return {
+            "previous_month_to_date": self._stats["previous_month_medals_to_date"],
+            "previous_month": self._stats["previous_month_medals"],
+        }
+
+
+class PollingIntervalSensor(BonusdriveEntity, SensorEntity):
+    """Diagnostic sensor for the current adaptive polling interval."""
+
+    _attr_translation_key = "polling_interval"
+    _attr_icon = "mdi:timer-sync-outline"
+    _data_slice = "update_interval"
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_native_unit_of_measurement = UnitOfTime.MINUTES
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+
+    def __init__(self, coordinator: BonusdriveDataUpdateCoordinator) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator)
+        self._attr_unique_id = f"{coordinator.config_entry.entry_id}_polling_interval"
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the current update interval in minutes."""
+        if self.coordinator.update_interval is None:
+            return None
+        return self.coordinator.update_interval.total_seconds() / 60
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return why the interval was chosen."""
+        return {"reason": self.coordinator.update_interval_reason}
+
+
+class ApiStatusSensor(BonusdriveEntity, SensorEntity):
+    """Diagnostic sensor for the circuit breaker guarding the API."""
+
+    _attr_translation_key = "api_status"
+    _attr_icon = "mdi:api"
+    _data_slice = "api_status"
+    _attr_device_class = SensorDeviceClass.ENUM
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+
+    _unsub_retry: CALLBACK_TYPE | None = None
+
+    def __init__(self, coordinator: BonusdriveDataUpdateCoordinator) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator)
+        self._breaker = coordinator.config_entry.runtime_data.client.breaker
+        self._attr_options = [state.value for state in BreakerState]
+        self._attr_unique_id = f"{coordinator.config_entry.entry_id}_api_status"
+
+    async def async_added_to_hass(self) -> None:
+        """Follow the breaker instead of the coordinator."""
+        await super().async_added_to_hass()
+        self.async_on_remove(self._breaker.async_add_listener(self._handle_breaker))
+        self.async_on_remove(self._cancel_retry)
+
+    @property
+    def available(self) -> bool:
+        """Stay available while the API is down, that's when it matters."""
+        return True
+
+    @property
+    def native_value(self) -> str:
+        """Return the breaker state."""
+        return self._breaker.state.value
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the failure count and when requests resume."""
+        return {
+            "failures": self._breaker.failures,
+            "retry_at": self._breaker.retry_at.isoformat()
+            if self._breaker.retry_at
+            else None,
+        }
+
+    @callback
+    def _handle_breaker(self, _now: datetime | None = None) -> None:
+        """Write the state, and again when an open breaker turns half-open."""
+        self._cancel_retry()
+        if self._breaker.state is BreakerState.OPEN and self._breaker.retry_at:
+            self._unsub_retry = async_track_point_in_utc_time(
+                self.hass, self._handle_breaker, self._breaker.retry_at
+            )
+        self.async_write_ha_state()
+
+    @callback
+    def _cancel_retry(self) -> None:
+        if self._unsub_retry is not None:
+            self._unsub_retry()
+            self._unsub_retry = None
+
+
+class RefreshDurationSensor(BonusdriveEntity, SensorEntity):
+    """Diagnostic sensor for the duration of the last refresh."""
+
+    _attr_translation_key = "refresh_duration"
+    _attr_icon = "mdi:timer-outline"
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_native_unit_of_measurement = UnitOfTime.MILLISECONDS
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+
+    def __init__(self, coordinator: BonusdriveDataUpdateCoordinator) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator)
+        self._attr_unique_id = f"{coordinator.config_entry.entry_id}_refresh_duration"
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the duration of the last refresh."""
+        refresh = self.coordinator.metrics.histograms.get("refresh")
+        if refresh is None or refresh.last_ms is None:
+            return None
+        return round(refresh.last_ms, 1)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the last duration of each stage."""
+        return {
+            f"{name}_ms": stage["last_ms"]
+            for name, stage in self.coordinator.metrics.as_dict().items()
+            if name != "refresh"
+        }
+
+
+class ApiLatencySensor(BonusdriveEntity, SensorEntity):
+    """Diagnostic sensor for the mean latency of API calls."""
+
+    _attr_translation_key = "api_latency"
+    _attr_icon = "mdi:speedometer"
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_native_unit_of_measurement = UnitOfTime.MILLISECONDS
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+
+    def __init__(self, coordinator: BonusdriveDataUpdateCoordinator) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator)
+        self._metrics = coordinator.config_entry.runtime_data.client.metrics
+        self._attr_unique_id = f"{coordinator.config_entry.entry_id}_api_latency"
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the mean latency over all API calls."""
+        histograms = self._metrics.histograms.values()
+        count = sum(histogram.count for histogram in histograms)
+        if not count:
+            return None
+        return round(sum(histogram.total_ms for histogram in histograms) / count, 1)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the mean latency and error count of each endpoint."""
+        attributes: dict[str, Any] = {}
+        for name, endpoint in self._metrics.as_dict().items():
+            attributes[f"{name}_mean_ms"] = endpoint["mean_ms"]
+            attributes[f"{name}_errors"] = endpoint["errors"]
+        return attributes
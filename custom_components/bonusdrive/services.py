@@ -0,0 +1,230 @@
+"""
+Services for on-demand trip and score queries.
+
+The services are registered on integration setup, so the modules behind them
+are imported by the handlers: they only run for a loaded entry, whose setup
+has imported them already.
+"""
+
+from __future__ import annotations
+
+from datetime import UTC, date, datetime
+from typing import TYPE_CHECKING, Any
+
+import voluptuous as vol
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.core import SupportsResponse, callback
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse
+
+    from .archive import TripSummary
+    from .data import BonusdriveConfigEntry
+
+SERVICE_GET_TRIPS = "get_trips"
+SERVICE_GET_TRIP = "get_trip"
+SERVICE_GET_SCORES = "get_scores"
+
+ATTR_CONFIG_ENTRY_ID = "config_entry_id"
+ATTR_START = "start"
+ATTR_END = "end"
+ATTR_TRIP_ID = "trip_id"
+ATTR_DETAILS = "details"
+ATTR_ROUTE = "route"
+
+GET_TRIPS_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Optional(ATTR_START): cv.datetime,
+        vol.Optional(ATTR_END): cv.datetime,
+    }
+)
+GET_TRIP_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Required(ATTR_TRIP_ID): cv.string,
+        vol.Optional(ATTR_DETAILS, default=False): cv.boolean,
+        vol.Optional(ATTR_ROUTE, default=False): cv.boolean,
+    }
+)
+GET_SCORES_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Required(ATTR_START): cv.date,
+        vol.Optional(ATTR_END): cv.date,
+    }
+)
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the services, once for all config entries."""
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_TRIPS,
+        _async_get_trips,
+        schema=GET_TRIPS_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_TRIP,
+        _async_get_trip,
+        schema=GET_TRIP_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_SCORES,
+        _async_get_scores,
+        schema=GET_SCORES_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+
+
+def _loaded_entry(call: ServiceCall) -> BonusdriveConfigEntry:
+    """Return the loaded config entry a service call is for."""
+    entry: BonusdriveConfigEntry | None = call.hass.config_entries.async_get_entry(
+        call.data[ATTR_CONFIG_ENTRY_ID]
+    )
+    if entry is None or entry.domain != DOMAIN:
+        raise ServiceValidationError(
+            translation_domain=DOMAIN, translation_key="unknown_entry"
+        )
+    if entry.state is not ConfigEntryState.LOADED:
+        raise ServiceValidationError(
+            translation_domain=DOMAIN, translation_key="entry_not_loaded"
+        )
+    return entry
+
+
+def _timestamp(value: datetime | None) -> int | None:
+    """Return a datetime (local time if naive) as ms since the epoch."""
+    return round(dt_util.as_utc(value).timestamp() * 1000) if value else None
+
+
+def _trip_data(entry_id: str, summary: TripSummary) -> dict[str, Any]:
+    """Return a trip in the format of the new trip events, plus its sub-scores."""
+    from .routes import route_url  # noqa: PLC0415 Imported by the entry setup
+
+    return {
+        "trip_id": summary["trip_id"],
+        "start": datetime.fromtimestamp(summary["start"] / 1000, tz=UTC).isoformat(),
+        "end": datetime.fromtimestamp(summary["end"] / 1000, tz=UTC).isoformat(),
+        "distance": summary["kilometers"],
+        "duration": summary["seconds"],
+        "score": summary["score"],
+        "speeding": summary["speeding"],
+        "harsh_braking": summary["harsh_braking"],
+        "harsh_acceleration": summary["harsh_acceleration"],
+        "harsh_cornering": summary["harsh_cornering"],
+        "payd": summary["payd"],
+        "route_url": route_url(entry_id, summary["trip_id"]),
+    }
+
+
+async def _async_get_trips(call: ServiceCall) -> ServiceResponse:
+    """
+    Return the trips that started in a time range, newest first.
+
+    Trips come from the archive. Only if it doesn't reach back to the start
+    yet, older trips are downloaded first.
+    """
+    entry = _loaded_entry(call)
+    start = _timestamp(call.data.get(ATTR_START))
+    end = _timestamp(call.data.get(ATTR_END))
+    history = entry.runtime_data.history
+    complete = await history.async_backfill_until(entry.runtime_data.client, start)
+    trips = await history.async_trips_between(start, end)
+    return {
+        "trips": [_trip_data(entry.entry_id, summary) for summary in trips],
+        # False if the API failed before all trips in the range were known
+        "complete": complete,
+    }
+
+
+async def _async_get_trip(call: ServiceCall) -> ServiceResponse:
+    """
+    Return a trip, optionally with its details and its route.
+
+    The trip comes from the archive. Details (locations, speeds) are fetched
+    from the API, once per trip, as are trips that aren't archived yet.
+    """
+    entry = _loaded_entry(call)
+    from .api import (  # noqa: PLC0415 Imported by the entry setup
+        BonusdriveApiClientError,
+    )
+    from .archive import trip_summary  # noqa: PLC0415 Imported by the entry setup
+    from .routes import async_trip_points  # noqa: PLC0415 Imported by the entry setup
+
+    trip_id = call.data[ATTR_TRIP_ID]
+    client = entry.runtime_data.client
+    summary = await entry.runtime_data.history.async_summary(trip_id)
+    trip = None
+    if summary is None or call.data[ATTR_DETAILS]:
+        try:
+            trip = await client.async_get_trip_details(trip_id)
+        except BonusdriveApiClientError as exception:
+            raise HomeAssistantError(
+                translation_domain=DOMAIN,
+                translation_key="trip_unavailable",
+                translation_placeholders={"trip_id": trip_id},
+            ) from exception
+
+    data = _trip_data(entry.entry_id, summary or trip_summary(trip))
+    if trip is not None and call.data[ATTR_DETAILS]:
+        data |= {
+            "start_location": trip.start_point_string,
+            "end_location": trip.end_point_string,
+            "avg_speed": trip.avgKilometersPerHour,
+            "max_speed": trip.maxKilometersPerHour,
+            "idle_duration": trip.secondsOfIdling,
+            "events": trip.eventsCount,
+        }
+    if call.data[ATTR_ROUTE]:
+        # [latitude, longitude] pairs, simplified like the GeoJSON route
+        points = await async_trip_points(call.hass, entry, trip_id)
+        data["route"] = [list(point) for point in points or []]
+    return {"trip": data}
+
+
+async def _async_get_scores(call: ServiceCall) -> ServiceResponse:
+    """
+    Return the daily scores of a date range and their average.
+
+    Past days are stored once fetched, so only days that were never requested
+    (and the last two days, which may still change) cost a request.
+    """
+    entry = _loaded_entry(call)
+    from .api import (  # noqa: PLC0415 Imported by the entry setup
+        BonusdriveApiClientError,
+    )
+    from .scores import daily_average  # noqa: PLC0415 Imported by the entry setup
+
+    today = datetime.now(tz=UTC).date()
+    start: date = call.data[ATTR_START]
+    end: date = call.data.get(ATTR_END, today)
+    if end < start:
+        raise ServiceValidationError(
+            translation_domain=DOMAIN, translation_key="end_before_start"
+        )
+    try:
+        days = await entry.runtime_data.scores.async_daily(
+            entry.runtime_data.client, start, end, today
+        )
+    except BonusdriveApiClientError as exception:
+        raise HomeAssistantError(
+            translation_domain=DOMAIN, translation_key="scores_unavailable"
+        ) from exception
+    return {
+        "start": start.isoformat(),
+        "end": min(end, today).isoformat(),
+        # Only days with trips
+        "days": dict(days),
+        "average": dict(daily_average(days)),
+    }
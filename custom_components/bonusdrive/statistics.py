@@ -0,0 +1,172 @@
+"""Long-term statistics import for bonusdrive."""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from homeassistant.components.recorder import get_instance
+from homeassistant.components.recorder.models import (
+    StatisticData,
+    StatisticMeanType,
+    StatisticMetaData,
+)
+from homeassistant.components.recorder.statistics import async_add_external_statistics
+from homeassistant.const import UnitOfLength, UnitOfTime
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN, LOGGER
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+    from .archive import TripSummary
+    from .data import BonusdriveConfigEntry
+    from .history import BonusdriveTripHistory
+
+HOUR_MS = 3_600_000
+
+
+@dataclass(frozen=True, slots=True)
+class TripStatistic:
+    """A trip field imported as long-term statistic."""
+
+    key: str
+    name: str
+    field: str
+    unit: str | None = None
+    has_sum: bool = False
+    scale: float = 1.0
+
+
+STATISTICS: tuple[TripStatistic, ...] = (
+    TripStatistic(
+        "distance", "distance", "kilometers", UnitOfLength.KILOMETERS, has_sum=True
+    ),
+    TripStatistic(
+        "driving_time",
+        "driving time",
+        "seconds",
+        UnitOfTime.MINUTES,
+        has_sum=True,
+        scale=1 / 60,
+    ),
+    TripStatistic("trip_score", "trip score", "score"),
+    TripStatistic("speeding_score", "speeding score", "speeding"),
+    TripStatistic("harsh_braking_score", "harsh braking score", "harsh_braking"),
+    TripStatistic(
+        "harsh_acceleration_score", "harsh acceleration score", "harsh_acceleration"
+    ),
+    TripStatistic("harsh_cornering_score", "harsh cornering score", "harsh_cornering"),
+    TripStatistic("payd_score", "day, time, road type score", "payd"),
+)
+
+
+def statistic_id(entry: BonusdriveConfigEntry, statistic: TripStatistic) -> str:
+    """Return the external statistic ID of a config entry."""
+    return f"{DOMAIN}:{entry.entry_id.lower()}_{statistic.key}"
+
+
+async def async_import_trip_statistics(
+    hass: HomeAssistant,
+    entry: BonusdriveConfigEntry,
+    history: BonusdriveTripHistory,
+) -> None:
+    """
+    Import trips into long-term statistics.
+
+    Statistics are hourly, so every hour with at least one trip (by start
+    time) becomes one row: distance and driving time are summed, scores are
+    distance-weighted means with min/max. Each run recomputes only the hours
+    spanned by the trips archived since the last run, so trips that show up
+    late or come in with the backfill still land in the right hour. The
+    running sums before those hours are taken from the archive, and the sums
+    of the hours after them are shifted by the added totals.
+    """
+    imported = history.statistics_state.get("imported_trips", 0)
+    archived = len(history)
+    if imported >= archived:
+        return
+    if (start_range := await history.async_start_range(imported)) is None:
+        return
+    first_hour = start_range[0] // HOUR_MS * HOUR_MS
+    end = start_range[1] // HOUR_MS * HOUR_MS + HOUR_MS
+
+    trips = await history.async_trips_between(start=first_hour, end=end)
+    hours: dict[int, list[TripSummary]] = defaultdict(list)
+    for trip in trips:
+        hours[trip["start"] // HOUR_MS * HOUR_MS].append(trip)
+
+    sums: dict[str, float] = {
+        stat.key: await history.async_total(stat.field, end=first_hour) * stat.scale
+        for stat in STATISTICS
+        if stat.has_sum
+    }
+    # Totals of the new trips, by which the sums of later hours grow
+    added: dict[str, float] = {
+        stat.key: await history.async_total(stat.field, first_row=imported) * stat.scale
+        for stat in STATISTICS
+        if stat.has_sum
+    }
+    rows: dict[str, list[StatisticData]] = {stat.key: [] for stat in STATISTICS}
+    for hour in sorted(hours):
+        start = dt_util.utc_from_timestamp(hour / 1000)
+        for stat in STATISTICS:
+            values = [
+                (trip[stat.field] * stat.scale, trip["kilometers"])
+                for trip in hours[hour]
+                if trip[stat.field] is not None
+            ]
+            if not values:
+                continue
+            if stat.has_sum:
+                total = sum(value for value, _ in values)
+                sums[stat.key] += total
+                rows[stat.key].append(
+                    StatisticData(start=start, state=total, sum=sums[stat.key])
+                )
+                continue
+            weight = sum(kilometers for _, kilometers in values)
+            mean = (
+                sum(value * kilometers for value, kilometers in values) / weight
+                if weight
+                else sum(value for value, _ in values) / len(values)
+            )
+            rows[stat.key].append(
+                StatisticData(
+                    start=start,
+                    mean=mean,
+                    min=min(value for value, _ in values),
+                    max=max(value for value, _ in values),
+                )
+            )
+
+    for stat in STATISTICS:
+        if not rows[stat.key]:
+            continue
+        async_add_external_statistics(
+            hass,
+            StatisticMetaData(
+                mean_type=StatisticMeanType.NONE
+                if stat.has_sum
+                else StatisticMeanType.ARITHMETIC,
+                has_sum=stat.has_sum,
+                name=f"{entry.title} {stat.name}",
+                source=DOMAIN,
+                statistic_id=statistic_id(entry, stat),
+                unit_of_measurement=stat.unit,
+            ),
+            rows[stat.key],
+        )
+        if added.get(stat.key) and stat.unit is not None:
+            # Imported hours after the new trips still have the old sums
+            get_instance(hass).async_adjust_statistics(
+                statistic_id(entry, stat),
+                dt_util.utc_from_timestamp(end / 1000),
+                added[stat.key],
+                stat.unit,
+            )
+
+    LOGGER.debug("Imported statistics for %s trips in %s hours", len(trips), len(hours))
+    await history.async_set_statistics_state({"imported_trips": archived})
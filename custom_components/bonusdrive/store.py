@@ -0,0 +1,62 @@
+"""Persistent storage for bonusdrive."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, TypedDict
+
+from homeassistant.core import callback
+from homeassistant.helpers.storage import Store
+from homeassistant.util.hass_dict import HassKey
+
+from .const import DOMAIN
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+STORAGE_VERSION = 1
+
+# TGTs validated by a config flow, keyed by unique ID, until the entry is set up
+DATA_FLOW_SESSIONS: HassKey[dict[str, str]] = HassKey(f"{DOMAIN}_flow_sessions")
+
+
+class SessionData(TypedDict):
+    """Stored session of a config entry."""
+
+    tgt: str
+
+
+class BonusdriveSessionStore:
+    """Persist the ticket-granting ticket (TGT) of a config entry."""
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize the store."""
+        self._store: Store[SessionData] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}.session", private=True
+        )
+
+    async def async_load(self) -> str | None:
+        """Return the stored TGT, if any."""
+        data = await self._store.async_load()
+        return data.get("tgt") if data else None
+
+    async def async_save(self, tgt: str) -> None:
+        """Store a TGT."""
+        await self._store.async_save({"tgt": tgt})
+
+    async def async_remove(self) -> None:
+        """Remove the stored session."""
+        await self._store.async_remove()
+
+
+@callback
+def async_hand_over_session(hass: HomeAssistant, unique_id: str, tgt: str) -> None:
+    """Keep the TGT of a config flow for the setup of its entry."""
+    hass.data.setdefault(DATA_FLOW_SESSIONS, {})[unique_id] = tgt
+
+
+@callback
+def async_take_over_session(hass: HomeAssistant, unique_id: str | None) -> str | None:
+    """Return the TGT a config flow handed over to an entry, if any."""
+    if unique_id is None:
+        return None
+    return hass.data.get(DATA_FLOW_SESSIONS, {}).pop(unique_id, None)
@@ -0,0 +1,429 @@
+"""Native asyncio transport for the Allianz BonusDrive API."""
+
+from __future__ import annotations
+
+import asyncio
+from contextlib import nullcontext
+from typing import TYPE_CHECKING, Any
+
+import polyline
+from allianz_bonusdrive_client import (
+    Badge,
+    BadgeLevel,
+    Scores,
+    Trip,
+    TripScores,
+    User,
+    Vehicle,
+)
+from yarl import URL
+
+if TYPE_CHECKING:
+    import aiohttp
+
+    from .geocode import GeocodeCache
+    from .metrics import BonusdriveMetrics
+
+# Upper bound for requests in flight per account
+MAX_CONCURRENT_REQUESTS = 4
+
+# Precision of the encoded trip polyline
+POLYLINE_PRECISION = 6
+
+HTTP_CREATED = 201
+HTTP_NO_CONTENT = 204
+HTTP_UNAUTHORIZED = 401
+HTTP_NOT_FOUND = 404
+
+# Headers sent by the BonusDrive app
+LOGIN_HEADERS = {
+    "Accept": "*/*",
+    "Accept-Language": "en-US",
+    "App-Version": "4.1.0",
+    "Content-Type": "application/x-www-form-urlencoded",
+    "Platform": "Android",
+    "User-Agent": "Dalvik/2.1.0 (Linux; U; Android 13; Pixel 5 Build/TQ3A.230901.001)",
+    "X-Requested-With": "XMLHttpRequest",
+}
+API_HEADERS = {
+    "Accept-Language": "en-US",
+    "Platform": "Android",
+    "User-Agent": "okhttp/4.12.0",
+}
+TRIP_EXPAND = ("events", "points", "scores", "user", "vehicle", "alerts")
+
+
+class BonusdriveAsyncTransport:
+    """
+    Async counterpart of the library's BonusdriveAPIClient.
+
+    Speaks the same endpoints and returns the same dataclasses, but runs on an
+    aiohttp session instead of a blocking requests session in the executor.
+    The method names mirror the library so both can be used interchangeably.
+    """
+
+    def __init__(  # noqa: PLR0913 Too many arguments in function definition
+        self,
+        session: aiohttp.ClientSession,
+        base_url: str,
+        email: str,
+        password: str,
+        photon_url: str | None = None,
+        geocode_cache: GeocodeCache | None = None,
+        metrics: BonusdriveMetrics | None = None,
+    ) -> None:
+        """Initialize the transport."""
+        self._session = session
+        self._base_url = base_url.rstrip("/")
+        self._email = email
+        self._password = password
+        self._photon_url = photon_url.rstrip("/") if photon_url else None
+        self._geocode_cache = geocode_cache
+        self._metrics = metrics
+        self._semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+        self._user_id: str | None = None
+        self._vehicle_id: str | None = None
+        self.tgt: str | None = None
+
+    async def _request_tgt(self) -> str:
+        """Request a new TGT with the account credentials."""
+        async with (
+            self._semaphore,
+            self._session.post(
+                f"{self._base_url}/cas/rest/v1/rbtickets",
+                data={
+                    "username": self._email,
+                    "password": self._password,
+                    "rememberMe": "true",
+                },
+                headers=LOGIN_HEADERS,
+            ) as response,
+        ):
+            response.raise_for_status()
+            if response.status != HTTP_CREATED:
+                msg = f"Failed to obtain TGT ({response.status})"
+                raise RuntimeError(msg)
+            self.tgt = (await response.text()).strip()
+        return self.tgt
+
+    async def authenticate(self) -> None:
+        """Exchange the TGT for a service ticket and session cookies."""
+        if not self.tgt:
+            await self._request_tgt()
+
+        async with (
+            self._semaphore,
+            self._session.post(
+                f"{self._base_url}/cas/rest/v1/rbtickets/tgt",
+                data={
+                    "ticketGrantingTicketId": self.tgt,
+                    "service": f"{self._base_url}/ipaid/",
+                },
+                headers=LOGIN_HEADERS,
+            ) as response,
+        ):
+            if response.status == HTTP_NOT_FOUND:
+                service_ticket = None
+            else:
+                response.raise_for_status()
+                service_ticket = (await response.text()).strip()
+        if service_ticket is None:
+            # TGT is invalid, log in again
+            self.tgt = None
+            await self.authenticate()
+            return
+
+        # Redeem the service ticket, the session cookies end up in the jar
+        async with (
+            self._semaphore,
+            self._session.post(
+                f"{self._base_url}/ipaid/",
+                data={"ticket": service_ticket},
+                headers=LOGIN_HEADERS,
+                allow_redirects=False,
+            ) as response,
+        ):
+            response.release()
+
+        session = await self._get("/ipaid/api/v2/session", retry=False)
+        self._user_id = str(session["userId"])
+        self._session.cookie_jar.update_cookies(
+            {"User-ID": self._user_id}, URL(self._base_url)
+        )
+
+    async def _get(
+        self,
+        path: str,
+        params: list[tuple[str, str]] | None = None,
+        *,
+        retry: bool = True,
+    ) -> Any:
+        """GET a JSON endpoint, re-authenticating once if the session expired."""
+        async with (
+            self._semaphore,
+            self._session.get(
+                f"{self._base_url}{path}", params=params, headers=API_HEADERS
+            ) as response,
+        ):
+            if response.status != HTTP_UNAUTHORIZED or not retry:
+                response.raise_for_status()
+                if response.status == HTTP_NO_CONTENT:
+                    return None
+                return await response.json(content_type=None)
+
+        await self.authenticate()
+        return await self._get(path, params, retry=False)
+
+    async def get_vehicleId(self) -> str:  # noqa: N802 Mirrors the library
+        """Return the ID of the first vehicle (cached after the first call)."""
+        if self._vehicle_id is None:
+            vehicles = await self._get(f"/ipaid/api/v2/users/{self._user_id}/vehicles")
+            if not vehicles:
+                msg = "No vehicles found for the authenticated user."
+                raise RuntimeError(msg)
+            self._vehicle_id = str(vehicles[0]["vehicleId"])
+        return self._vehicle_id
+
+    async def get_trips(self, amount: int = 10, offset: int = 0) -> list[Trip]:
+        """Return a page of trips, newest first."""
+        params = [
+            ("offset", str(offset)),
+            ("limit", str(amount)),
+            ("sort", "local_startdate;desc"),
+            *(("expand", expand) for expand in TRIP_EXPAND),
+        ]
+        data = await self._get(
+            f"/ipaid/api/v2/users/{self._user_id}/logbook/trips", params
+        )
+        return [_parse_trip(item["trip"]) for item in (data or {}).get("items", [])]
+
+    async def get_trip_details(self, tripId: str) -> Trip:  # noqa: N803 Mirrors the library
+        """Return a single trip with decoded geometry and location strings."""
+        vehicle_id = await self.get_vehicleId()
+        data = await self._get(
+            f"/ipaid/api/v2/vehicles/{vehicle_id}/trips/{tripId}",
+            [("expand", expand) for expand in TRIP_EXPAND],
+        )
+
+        decoded = (
+            polyline.decode(data["geometry"], POLYLINE_PRECISION)
+            if data.get("geometry")
+            else None
+        )
+        start_string = end_string = None
+        if decoded:
+            start_string, end_string = await asyncio.gather(
+                self._async_location_string(*decoded[0]),
+                self._async_location_string(*decoded[-1]),
+            )
+        return _parse_trip(data, decoded, start_string, end_string)
+
+    async def get_badges(
+        self,
+        type: str = "daily",  # noqa: A002 Mirrors the library
+        startDate: str | None = None,  # noqa: N803
+        endDate: str | None = None,  # noqa: N803
+    ) -> list[Badge]:
+        """Return the badges of a date range."""
+        vehicle_id = await self.get_vehicleId()
+        params = [("type", type)]
+        if startDate:
+            params.append(("startDate", startDate))
+        if endDate:
+            params.append(("endDate", endDate))
+        data = await self._get(f"/ipaid/api/v2/vehicles/{vehicle_id}/badges", params)
+        return [_parse_badge(badge) for badge in data or []]
+
+    async def get_scores(
+        self,
+        startDate: str | None = None,  # noqa: N803 Mirrors the library
+        endDate: str | None = None,  # noqa: N803
+    ) -> dict[str, Scores] | list:
+        """Return the scores of a date range, keyed by date."""
+        vehicle_id = await self.get_vehicleId()
+        params = []
+        if startDate:
+            params.append(("startDate", startDate))
+        if endDate:
+            params.append(("endDate", endDate))
+        data = await self._get(f"/ipaid/api/v2/vehicles/{vehicle_id}/scores", params)
+        if not data:
+            return []
+        return {score.get("date"): _parse_period_scores(score) for score in data}
+
+    async def _async_location_string(self, lat: float, lon: float) -> str | None:
+        """Reverse geocode a point, or format it as coordinates without Photon."""
+        if not self._photon_url:
+            return (
+                f"{'N' if lat >= 0 else 'S'}{abs(lat):.6f}, "
+                f"{'E' if lon >= 0 else 'W'}{abs(lon):.6f}"
+            )
+        if (
+            self._geocode_cache is None
+            or (data := self._geocode_cache.get(lat, lon)) is None
+        ):
+            try:
+                with (
+                    self._metrics.measure("photon") if self._metrics else nullcontext()
+                ):
+                    async with self._session.get(
+                        f"{self._photon_url}/reverse",
+                        params={"lat": str(lat), "lon": str(lon)},
+                        headers={"Accept": "application/json"},
+                    ) as response:
+                        response.raise_for_status()
+                        data = await response.json(content_type=None)
+            except Exception:  # noqa: BLE001 Geocoding is best effort
+                return None
+            if self._geocode_cache is not None and isinstance(data, dict):
+                self._geocode_cache.set(lat, lon, data)
+        features = data.get("features") if isinstance(data, dict) else None
+        if not features:
+            return None
+        return format_location(features[0].get("properties") or {})
+
+
+def format_location(props: dict[str, Any]) -> str:
+    """Format Photon feature properties the way the library does."""
+    name = props.get("name") or (
+        f"{props.get('street')} {props.get('housenumber') or ''}".strip()
+        if props.get("street")
+        else ""
+    )
+    parts = (name, props.get("city"), props.get("country"))
+    return ", ".join(part for part in parts if part)
+
+
+def _parse_scores(data: dict[str, Any]) -> Scores:
+    """Parse the scores of a single trip."""
+    return Scores(
+        over_speeding=data["over.speeding"],
+        speeding=data["speeding"],
+        distracted_driving=data["distracted.driving"],
+        payd=data["payd"],
+        overall=data["overall"],
+        harsh_cornering=data["harsh.cornering"],
+        harsh_acceleration=data["harsh.acceleration"],
+        harsh_braking=data["harsh.braking"],
+        mileage=data["mileage"],
+    )
+
+
+def _parse_period_scores(data: dict[str, Any]) -> Scores:
+    """Parse an entry of the scores endpoint."""
+    components = data.get("componentScores") or {}
+
+    def component(key: str) -> float:
+        return (components.get(key) or {}).get("score", 0.0)
+
+    return Scores(
+        overall=data.get("score", 0.0),
+        over_speeding=component("over.speeding"),
+        harsh_braking=component("harsh.braking"),
+        harsh_acceleration=component("harsh.acceleration"),
+        harsh_cornering=component("harsh.cornering"),
+        payd=component("payd"),
+        speeding=component("speeding"),
+        distracted_driving=component("distracted.driving"),
+        mileage=component("mileage"),
+    )
+
+
+def _parse_badge(data: dict[str, Any]) -> Badge:
+    """Parse a badge."""
+    return Badge(
+        badgeType=data["badgeType"],
+        level=data["level"],
+        pointsAwarded=data["pointsAwarded"],
+        date=data["date"],
+        state=data["state"],
+        usedBadgeLevels=[
+            BadgeLevel(
+                level=level["level"],
+                minimumValue=level["minimumValue"],
+                maximumValue=level["maximumValue"],
+            )
+            for level in data.get("usedBadgeLevels", [])
+        ],
+    )
+
+
+def _parse_trip(
+    data: dict[str, Any],
+    decoded_geometry: list[tuple[float, float]] | None = None,
+    start_point_string: str | None = None,
+    end_point_string: str | None = None,
+) -> Trip:
+    """Parse a trip into the library's dataclass."""
+    vehicle = data["vehicle"]
+    user = data["user"]
+    trip_scores = data["tripScores"]
+    return Trip(
+        events=data.get("events"),
+        tripId=data["tripId"],
+        tripStartTimestampUtc=data["tripStartTimestampUtc"],
+        tripEndTimestampUtc=data["tripEndTimestampUtc"],
+        tripStartTimestampLocal=data["tripStartTimestampLocal"],
+        tripEndTimestampLocal=data["tripEndTimestampLocal"],
+        tripProcessingEndTimestampUtc=data["tripProcessingEndTimestampUtc"],
+        kilometers=data["kilometers"],
+        avgKilometersPerHour=data["avgKilometersPerHour"],
+        maxKilometersPerHour=data["maxKilometersPerHour"],
+        seconds=data["seconds"],
+        secondsOfIdling=data["secondsOfIdling"],
+        timeZoneOffsetMillis=data["timeZoneOffsetMillis"],
+        tripStatus=data["tripStatus"],
+        pois=data.get("pois"),
+        transportMode=data["transportMode"],
+        transportModeMessageKey=data["transportModeMessageKey"],
+        transportModeReason=data.get("transportModeReason"),
+        geometry=data["geometry"],
+        snappedGeometry=data.get("snappedGeometry", []),
+        reconstructedStartGeometry=data["reconstructedStartGeometry"],
+        tripStartStatus=data["tripStartStatus"],
+        verified=data["verified"],
+        hasAlerts=data["hasAlerts"],
+        alerts=data.get("alerts"),
+        vehicle=Vehicle(
+            vehicleId=vehicle["vehicleId"],
+            make=vehicle["make"],
+            model=vehicle["model"],
+            nickname=vehicle.get("nickname"),
+            year=vehicle.get("year"),
+            plate=vehicle.get("plate"),
+            avatar=vehicle.get("avatar"),
+            accountId=vehicle.get("accountId"),
+            accountNumber=vehicle.get("accountNumber"),
+            policyInceptionDate=vehicle.get("policyInceptionDate"),
+            policyStartDate=vehicle.get("policyStartDate"),
+            extraAccountId=vehicle.get("extraAccountId"),
+            extraAccountNumber=vehicle.get("extraAccountNumber"),
+        ),
+        user=User(
+            userId=user["userId"],
+            publicDisplayName=user["publicDisplayName"],
+            avatar=user.get("avatar"),
+            sharedInformation=user.get("sharedInformation"),
+            associatedUsers=user.get("associatedUsers"),
+            account=user.get("account"),
+            userRole=user.get("userRole"),
+            accountRole=user.get("accountRole"),
+            firstName=user["firstName"],
+            lastName=user["lastName"],
+        ),
+        device=data.get("device"),
+        tripScores=TripScores(
+            scores=_parse_scores(trip_scores["scores"]),
+            scoreType=trip_scores["scoreType"],
+        ),
+        milStatus=data.get("milStatus"),
+        dtcCount=data.get("dtcCount"),
+        tripScore=data["tripScore"],
+        eventsCount=data["eventsCount"],
+        private=data["private"],
+        tripUUID=data["tripUUID"],
+        purpose=data["purpose"],
+        decoded_geometry=decoded_geometry,
+        start_point_string=start_point_string,
+        end_point_string=end_point_string,
+    )
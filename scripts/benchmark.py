@@ -0,0 +1,589 @@
+# ruff: noqa: INP001 Standalone script
+"""
+Offline benchmark of the bonusdrive refresh path.
+
+Starts a stand-in for the BonusDrive (DriveSync) API and a Photon server on
+localhost, sets up the integration against them in a throwaway Home Assistant
+instance and reports for every refresh:
+
+- wall time of the coordinator refresh, including the entity state writes,
+  and until Home Assistant is idle again (history backfill, statistics)
+- time spent in executor threads and the average number of busy threads
+- peak traced memory and the change in allocated memory blocks
+- requests served by the stand-in servers and state writes of the entities
+
+Latency and payload size are configurable, so slow servers, very long
+polylines and long trip histories can be benchmarked without an account.
+Run it with ``scripts/benchmark``, see ``--help`` for the options.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import socket
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from datetime import UTC, date, datetime, timedelta
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import polyline
+from aiohttp import web
+from homeassistant import loader
+from homeassistant.auth import auth_manager_from_config
+from homeassistant.bootstrap import async_load_base_functionality
+from homeassistant.config_entries import ConfigEntries, ConfigEntry, ConfigEntryState
+from homeassistant.const import (
+    CONF_EMAIL,
+    CONF_PASSWORD,
+    EVENT_STATE_CHANGED,
+)
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.helpers.entity_platform import async_get_platforms
+from homeassistant.helpers.recorder import async_initialize_recorder
+from homeassistant.setup import async_setup_component
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+ROOT = Path(__file__).resolve().parent.parent
+DOMAIN = "bonusdrive"
+USER_ID = "bench-user"
+VEHICLE_ID = "bench-vehicle"
+# Spacing of the generated trips, newest first
+TRIP_SPACING = timedelta(hours=7)
+TRIP_DURATION = timedelta(minutes=25)
+
+
+@dataclass
+class Options:
+    """Benchmark settings."""
+
+    trips: int
+    points: int
+    latency: float
+    photon_latency: float
+    refreshes: int
+    new_trips: bool
+    native_transport: bool
+    photon: bool
+    trace_memory: bool
+
+
+class StandInBackend:
+    """
+    Stand-in for the BonusDrive API and Photon on one local server.
+
+    Trips are generated deterministically on first use and kept, so every
+    refresh sees the same payloads unless a new trip is added.
+    """
+
+    def __init__(self, options: Options) -> None:
+        """Initialize the backend."""
+        self._options = options
+        self._now = datetime.now(tz=UTC)
+        self._trips: list[dict[str, Any]] = [
+            self._trip(index, self._now - TRIP_SPACING * index)
+            for index in range(options.trips)
+        ]
+        self.requests: Counter[str] = Counter()
+        self._loop = asyncio.new_event_loop()
+        self._runner: web.AppRunner | None = None
+        self.url = ""
+
+    def _trip(self, index: int, end: datetime) -> dict[str, Any]:
+        """Generate a trip with a random walk as route."""
+        rng = random.Random(index)  # noqa: S311 Not used for security
+        lat, lon = 48.0 + rng.random(), 11.0 + rng.random()
+        points = []
+        for _ in range(self._options.points):
+            lat += rng.uniform(-1e-4, 1e-4)
+            lon += rng.uniform(-1e-4, 1e-4)
+            points.append((lat, lon))
+        start = end - TRIP_DURATION
+        start_ms, end_ms = int(start.timestamp() * 1000), int(end.timestamp() * 1000)
+        score = round(rng.uniform(60, 100), 1)
+        return {
+            "events": [],
+            "tripId": f"trip-{index}",
+            "tripStartTimestampUtc": start_ms,
+            "tripEndTimestampUtc": end_ms,
+            "tripStartTimestampLocal": start_ms,
+            "tripEndTimestampLocal": end_ms,
+            "tripProcessingEndTimestampUtc": end_ms,
+            "kilometers": round(rng.uniform(2, 80), 2),
+            "avgKilometersPerHour": 45.0,
+            "maxKilometersPerHour": 110.0,
+            "seconds": int(TRIP_DURATION.total_seconds()),
+            "secondsOfIdling": 60,
+            "timeZoneOffsetMillis": 0,
+            "tripStatus": "PROCESSED",
+            "pois": [],
+            "transportMode": "CAR",
+            "transportModeMessageKey": "car",
+            "transportModeReason": None,
+            "geometry": polyline.encode(points, 6),
+            "snappedGeometry": [],
+            "reconstructedStartGeometry": "",
+            "tripStartStatus": "OK",
+            "verified": True,
+            "hasAlerts": False,
+            "alerts": [],
+            "vehicle": {"vehicleId": VEHICLE_ID, "make": "Bench", "model": "Mark"},
+            "user": {
+                "userId": USER_ID,
+                "publicDisplayName": "Bench",
+                "firstName": "Bench",
+                "lastName": "Mark",
+            },
+            "tripScores": {
+                "scoreType": "TRIP",
+                "scores": {
+                    "over.speeding": score,
+                    "speeding": score,
+                    "distracted.driving": score,
+                    "payd": score,
+                    "overall": score,
+                    "harsh.cornering": score,
+                    "harsh.acceleration": score,
+                    "harsh.braking": score,
+                    "mileage": score,
+                },
+            },
+            "tripScore": score,
+            "eventsCount": 0,
+            "private": False,
+            "tripUUID": f"uuid-{index}",
+            "purpose": "PRIVATE",
+        }
+
+    def add_trip(self) -> None:
+        """Add a trip that ended just now."""
+        self._now = datetime.now(tz=UTC)
+        self._trips.insert(0, self._trip(len(self._trips), self._now))
+
+    def _app(self) -> web.Application:
+        """Return the routes of both servers."""
+        app = web.Application(middlewares=[self._middleware])
+        api = "/ipaid/api/v2"
+        app.router.add_post("/cas/rest/v1/rbtickets", self._tgt)
+        app.router.add_post("/cas/rest/v1/rbtickets/tgt", self._service_ticket)
+        app.router.add_post("/ipaid/", self._login)
+        app.router.add_get(f"{api}/session", self._session)
+        app.router.add_get(f"{api}/users/{{user}}/vehicles", self._vehicles)
+        app.router.add_get(f"{api}/users/{{user}}/logbook/trips", self._logbook)
+        app.router.add_get(f"{api}/vehicles/{{vehicle}}/trips/{{trip}}", self._details)
+        app.router.add_get(f"{api}/vehicles/{{vehicle}}/badges", self._badges)
+        app.router.add_get(f"{api}/vehicles/{{vehicle}}/scores", self._scores)
+        app.router.add_get("/reverse", self._reverse)
+        return app
+
+    @web.middleware
+    async def _middleware(
+        self,
+        request: web.Request,
+        handler: Callable[[web.Request], Any],
+    ) -> web.StreamResponse:
+        """Count the request and add the configured latency."""
+        route = request.match_info.route.resource
+        name = route.canonical if route is not None else request.path
+        self.requests[name] += 1
+        if name == "/reverse":
+            await asyncio.sleep(self._options.photon_latency)
+        else:
+            await asyncio.sleep(self._options.latency)
+        return await handler(request)
+
+    async def _tgt(self, _request: web.Request) -> web.Response:
+        return web.Response(status=201, text="TGT-bench")
+
+    async def _service_ticket(self, _request: web.Request) -> web.Response:
+        return web.Response(text="ST-bench")
+
+    async def _login(self, _request: web.Request) -> web.Response:
+        response = web.Response(status=302, headers={"Location": "/ipaid/app"})
+        response.set_cookie("JSESSIONID", "bench")
+        return response
+
+    async def _session(self, _request: web.Request) -> web.Response:
+        return web.json_response({"userId": USER_ID})
+
+    async def _vehicles(self, _request: web.Request) -> web.Response:
+        return web.json_response([{"vehicleId": VEHICLE_ID}])
+
+    async def _logbook(self, request: web.Request) -> web.Response:
+        offset = int(request.query.get("offset", 0))
+        limit = int(request.query.get("limit", 10))
+        page = self._trips[offset : offset + limit]
+        return web.json_response({"items": [{"trip": trip} for trip in page]})
+
+    async def _details(self, request: web.Request) -> web.Response:
+        trip_id = request.match_info["trip"]
+        for trip in self._trips:
+            if trip["tripId"] == trip_id:
+                return web.json_response(trip)
+        raise web.HTTPNotFound
+
+    async def _badges(self, request: web.Request) -> web.Response:
+        return web.json_response(
+            [
+                {
+                    "badgeType": request.query.get("type", "daily"),
+                    "level": 1,
+                    "pointsAwarded": 10,
+                    # Midnight of the last day, in epoch milliseconds
+                    "date": int(
+                        datetime.combine(
+                            date.fromisoformat(request.query["endDate"]),
+                            datetime.min.time(),
+                            UTC,
+                        ).timestamp()
+                        * 1000
+                    ),
+                    "state": "AWARDED",
+                    "usedBadgeLevels": [
+                        {"level": 1, "minimumValue": 90, "maximumValue": 100}
+                    ],
+                }
+            ]
+        )
+
+    async def _scores(self, request: web.Request) -> web.Response:
+        end = date.fromisoformat(request.query["endDate"])
+        day = date.fromisoformat(request.query["startDate"])
+        scores = []
+        while day <= end:
+            score = 60 + day.toordinal() % 40
+            scores.append(
+                {
+                    # Midnight of the day, in epoch milliseconds
+                    "date": int(
+                        datetime.combine(day, datetime.min.time(), UTC).timestamp()
+                        * 1000
+                    ),
+                    "score": score,
+                    "componentScores": {
+                        component: {"score": score}
+                        for component in (
+                            "over.speeding",
+                            "harsh.braking",
+                            "harsh.acceleration",
+                            "harsh.cornering",
+                            "payd",
+                            "speeding",
+                            "distracted.driving",
+                            "mileage",
+                        )
+                    },
+                }
+            )
+            day += timedelta(days=1)
+        return web.json_response(scores)
+
+    async def _reverse(self, request: web.Request) -> web.Response:
+        lat, lon = float(request.query["lat"]), float(request.query["lon"])
+        return web.json_response(
+            {
+                "features": [
+                    {
+                        "properties": {
+                            "name": f"Place {lat:.3f} {lon:.3f}",
+                            "city": "Benchtown",
+                            "country": "Germany",
+                        }
+                    }
+                ]
+            }
+        )
+
+    def start(self) -> None:
+        """Serve on a random port in a thread of its own."""
+        threading.Thread(target=self._loop.run_forever, daemon=True).start()
+        asyncio.run_coroutine_threadsafe(self._async_start(), self._loop).result()
+
+    async def _async_start(self) -> None:
+        self._runner = web.AppRunner(self._app(), access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        host, port = self._runner.addresses[0][:2]
+        self.url = f"http://{host}:{port}"
+
+    def stop(self) -> None:
+        """Stop the server and its thread."""
+        if self._runner is not None:
+            asyncio.run_coroutine_threadsafe(
+                self._runner.cleanup(), self._loop
+            ).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+
+
+class TimedExecutor(ThreadPoolExecutor):
+    """Thread pool that tracks how long its threads are busy."""
+
+    def __init__(self) -> None:
+        """Initialize the executor."""
+        super().__init__(thread_name_prefix="SyncWorker")
+        self._lock = threading.Lock()
+        self.busy = 0.0
+        self.jobs = 0
+
+    def submit(self, fn: Callable, /, *args: Any, **kwargs: Any) -> Any:
+        """Submit a job, timing its run."""
+
+        def timed() -> Any:
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                with self._lock:
+                    self.busy += time.perf_counter() - start
+                    self.jobs += 1
+
+        return super().submit(timed)
+
+
+@dataclass
+class RefreshResult:
+    """Measurements of one refresh."""
+
+    refresh_ms: float
+    idle_ms: float
+    executor_ms: float
+    executor_jobs: int
+    busy_threads: float
+    attributes_ms: float
+    state_writes: int
+    requests: dict[str, int] = field(default_factory=dict)
+    peak_kib: float | None = None
+    net_blocks: int | None = None
+
+
+async def _async_setup_hass(config_dir: Path, executor: TimedExecutor) -> HomeAssistant:
+    """Start a minimal Home Assistant with the integration's dependencies."""
+    asyncio.get_running_loop().set_default_executor(executor)
+    (config_dir / "custom_components").symlink_to(ROOT / "custom_components")
+    sys.path.insert(0, str(config_dir))
+
+    hass = HomeAssistant(str(config_dir))
+    hass.config.skip_pip = True
+    loader.async_setup(hass)
+    hass.config_entries = ConfigEntries(hass, {})
+    await async_load_base_functionality(hass)
+    hass.auth = await auth_manager_from_config(hass, [], [])
+    async_initialize_recorder(hass)
+    recorder = {"db_url": f"sqlite:///{config_dir / 'home-assistant_v2.db'}"}
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    for domain, config in (
+        ("recorder", recorder),
+        ("http", {"server_host": ["127.0.0.1"], "server_port": port}),
+    ):
+        if not await async_setup_component(hass, domain, {domain: config}):
+            msg = f"Setting up {domain} failed"
+            raise RuntimeError(msg)
+    return hass
+
+
+async def _async_benchmark(options: Options) -> list[RefreshResult]:
+    """Set up the integration against the stand-in and refresh repeatedly."""
+    backend = StandInBackend(options)
+    backend.start()
+    executor = TimedExecutor()
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = await _async_setup_hass(Path(config_dir), executor)
+        try:
+            return await _async_run(hass, backend, executor, options)
+        finally:
+            await hass.async_stop(force=True)
+            backend.stop()
+
+
+async def _async_run(
+    hass: HomeAssistant,
+    backend: StandInBackend,
+    executor: TimedExecutor,
+    options: Options,
+) -> list[RefreshResult]:
+    """Run the refreshes, the first one is the setup of the config entry."""
+    entry = ConfigEntry(
+        version=1,
+        minor_version=1,
+        domain=DOMAIN,
+        title="bench@example.com",
+        data={
+            CONF_EMAIL: "bench@example.com",
+            CONF_PASSWORD: "bench",
+            "base_url": backend.url,
+            "photon_url": backend.url if options.photon else None,
+            "native_transport": options.native_transport,
+        },
+        options={},
+        source="user",
+        unique_id="bench_example_com",
+        discovery_keys={},
+        subentries_data=None,
+    )
+
+    state_writes = 0
+
+    @callback
+    def _count_write(event: Event) -> None:
+        nonlocal state_writes
+        if event.data["entity_id"].startswith("sensor."):
+            state_writes += 1
+
+    hass.bus.async_listen(EVENT_STATE_CHANGED, _count_write)
+
+    results = []
+    for index in range(options.refreshes):
+        if index and options.new_trips:
+            backend.add_trip()
+        backend.requests.clear()
+        state_writes = 0
+        busy, jobs = executor.busy, executor.jobs
+        if options.trace_memory:
+            tracemalloc.reset_peak()
+            traced, _ = tracemalloc.get_traced_memory()
+        blocks = sys.getallocatedblocks()
+
+        start = time.perf_counter()
+        if index:
+            await entry.runtime_data.coordinator.async_refresh()
+        else:
+            await hass.config_entries.async_add(entry)
+            if entry.state is not ConfigEntryState.LOADED:
+                msg = f"Setting up the integration failed: {entry.reason}"
+                raise RuntimeError(msg)
+        refreshed = time.perf_counter()
+        # Includes the history backfill, which runs as background task
+        await hass.async_block_till_done(wait_background_tasks=True)
+        idle = time.perf_counter()
+
+        result = RefreshResult(
+            refresh_ms=(refreshed - start) * 1000,
+            idle_ms=(idle - start) * 1000,
+            executor_ms=(executor.busy - busy) * 1000,
+            executor_jobs=executor.jobs - jobs,
+            busy_threads=(executor.busy - busy) / (idle - start),
+            attributes_ms=_time_attributes(hass) * 1000,
+            state_writes=state_writes,
+            requests=dict(backend.requests),
+        )
+        if options.trace_memory:
+            result.peak_kib = (tracemalloc.get_traced_memory()[1] - traced) / 1024
+        result.net_blocks = sys.getallocatedblocks() - blocks
+        results.append(result)
+    return results
+
+
+def _time_attributes(hass: HomeAssistant) -> float:
+    """Return the time to compute the state and attributes of all entities."""
+    entities = [
+        entity
+        for platform in async_get_platforms(hass, DOMAIN)
+        for entity in platform.entities.values()
+    ]
+    start = time.perf_counter()
+    for entity in entities:
+        _ = entity.state, entity.extra_state_attributes
+    return time.perf_counter() - start
+
+
+def _report(options: Options, results: list[RefreshResult]) -> str:
+    """Format the results as table."""
+    lines = [
+        f"{options.trips} trips of {options.points} points, "
+        f"API latency {options.latency * 1000:.0f} ms, "
+        f"Photon {f'{options.photon_latency * 1000:.0f} ms' if options.photon else 'off'}, "  # noqa: E501
+        f"{'native' if options.native_transport else 'library'} transport",
+        "",
+        f"{'#':>2} {'refresh ms':>11} {'idle ms':>9} {'executor ms':>12} "
+        f"{'jobs':>5} {'threads':>8} {'attrs ms':>9} {'writes':>7} "
+        f"{'requests':>9} {'peak KiB':>9} {'net blocks':>11}",
+    ]
+    for index, result in enumerate(results):
+        peak = f"{result.peak_kib:9.0f}" if result.peak_kib is not None else f"{'-':>9}"
+        lines.append(
+            f"{index:>2} {result.refresh_ms:11.1f} {result.idle_ms:9.1f} "
+            f"{result.executor_ms:12.1f} {result.executor_jobs:5d} "
+            f"{result.busy_threads:8.2f} {result.attributes_ms:9.3f} "
+            f"{result.state_writes:7d} {sum(result.requests.values()):9d} "
+            f"{peak} {result.net_blocks:11d}"
+        )
+    return "\n".join(lines) + "\n"
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--trips", type=int, default=300, help="trips in the history")
+    parser.add_argument("--points", type=int, default=2000, help="GPS points per trip")
+    parser.add_argument(
+        "--latency", type=float, default=80, help="API latency in milliseconds"
+    )
+    parser.add_argument(
+        "--photon-latency",
+        type=float,
+        default=150,
+        help="Photon latency in milliseconds",
+    )
+    parser.add_argument("--refreshes", type=int, default=5, help="refreshes to run")
+    parser.add_argument(
+        "--new-trips",
+        action="store_true",
+        help="add a new trip before every refresh after the first",
+    )
+    parser.add_argument(
+        "--native-transport", action="store_true", help="use the aiohttp transport"
+    )
+    parser.add_argument(
+        "--no-photon", action="store_true", help="don't configure a Photon server"
+    )
+    parser.add_argument(
+        "--no-tracemalloc",
+        action="store_true",
+        help="skip memory tracing, which slows down the refreshes",
+    )
+    parser.add_argument("--json", type=Path, help="also write the results to a file")
+    args = parser.parse_args()
+
+    options = Options(
+        trips=args.trips,
+        points=args.points,
+        latency=args.latency / 1000,
+        photon_latency=args.photon_latency / 1000,
+        refreshes=args.refreshes,
+        new_trips=args.new_trips,
+        native_transport=args.native_transport,
+        photon=not args.no_photon,
+        trace_memory=not args.no_tracemalloc,
+    )
+    if options.trace_memory:
+        tracemalloc.start()
+    results = asyncio.run(_async_benchmark(options))
+    sys.stdout.write(_report(options, results))
+    if args.json:
+        args.json.write_text(
+            json.dumps(
+                {
+                    "options": asdict(options),
+                    "results": [asdict(result) for result in results],
+                },
+                indent=2,
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()